@@ -0,0 +1,66 @@
+"""
+Benchmark de arranque: mide el tiempo de importación del motor sin interfaz y de
+los módulos gráficos, y verifica que ninguno cargue matplotlib al importarse
+(y que el motor tampoco cargue tkinter).
+
+Uso: python bench_arranque.py [--repeticiones 5] [--presupuesto 0.5]
+Termina con código 1 si el motor supera el presupuesto (en segundos).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Cada medición corre en un intérprete nuevo para que no haya módulos ya cargados
+_SCRIPT = '''
+import json, sys, time
+t0 = time.perf_counter()
+import {modulo}
+dt = time.perf_counter() - t0
+print(json.dumps({{'tiempo': dt, 'tkinter': 'tkinter' in sys.modules,
+                  'matplotlib': 'matplotlib' in sys.modules}}))
+'''
+
+
+def medir(modulo, repeticiones):
+    """Devuelve (mejor tiempo en segundos, último resultado) de importar `modulo`."""
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, '-c', _SCRIPT.format(modulo=modulo)],
+                                cwd=DIRECTORIO, capture_output=True, text=True, check=True)
+        resultado = json.loads(salida.stdout.strip().splitlines()[-1])
+        tiempos.append(resultado['tiempo'])
+    return min(tiempos), resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark del tiempo de importación.')
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--presupuesto', type=float, default=0.5,
+                        help='Tiempo máximo permitido para importar el motor (s)')
+    args = parser.parse_args(argv)
+
+    errores = []
+    for modulo in ('motor', 'simulaciones_app', 'distribuciones_app'):
+        tiempo, resultado = medir(modulo, args.repeticiones)
+        print(f'{modulo:20s} {tiempo * 1000:8.1f} ms  '
+              f'tkinter={resultado["tkinter"]}  matplotlib={resultado["matplotlib"]}')
+        if resultado['matplotlib']:
+            errores.append(f'{modulo} importa matplotlib al cargarse')
+        if modulo == 'motor':
+            if resultado['tkinter']:
+                errores.append('motor importa tkinter al cargarse')
+            if tiempo > args.presupuesto:
+                errores.append(f'motor tarda {tiempo:.3f} s (presupuesto {args.presupuesto:.3f} s)')
+
+    for e in errores:
+        print('ERROR:', e)
+    return 1 if errores else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
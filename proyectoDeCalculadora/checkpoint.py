@@ -0,0 +1,132 @@
+import importlib
+import json
+import random
+
+import numpy as np
+
+# Modelos que se pueden restaurar: nombre de la clase -> módulo donde vive
+MODELOS = {
+    'CovidSimulation': 'covid_simulation',
+    'GameOfLife2D': 'game_of_life_2d',
+    'CovidNetworkSimulation': 'covid_network',
+    'CovidSEIRSimulation': 'seir_simulation',
+}
+
+FORMATO = 1
+
+
+def _estado_rng(rng):
+    """Devuelve (meta, arrays) con el estado completo de un generador."""
+    if isinstance(rng, random.Random):
+        version, mt, gauss_next = rng.getstate()
+        meta = {'tipo': 'random', 'version': version, 'gauss_next': gauss_next}
+        return meta, {'mt': np.array(mt, dtype=np.uint32)}
+    if isinstance(rng, np.random.Generator):
+        estado = rng.bit_generator.state
+        arrays = {k: v for k, v in estado['state'].items() if isinstance(v, np.ndarray)}
+        estado = dict(estado, state={k: v for k, v in estado['state'].items() if k not in arrays})
+        return {'tipo': 'numpy', 'estado': estado}, arrays
+    raise TypeError(f'Generador no soportado: {type(rng).__name__}')
+
+
+def _crear_rng(meta, arrays):
+    if meta['tipo'] == 'random':
+        rng = random.Random()
+        mt = tuple(int(x) for x in arrays['mt'])
+        rng.setstate((meta['version'], mt, meta['gauss_next']))
+        return rng
+    estado = meta['estado']
+    estado = dict(estado, state=dict(estado['state'], **arrays))
+    bit_generator = getattr(np.random, estado['bit_generator'])()
+    bit_generator.state = estado
+    return np.random.Generator(bit_generator)
+
+
+def _resembrar(rng, seed_seq):
+    """Crea un generador del mismo tipo que `rng` sembrado con `seed_seq`."""
+    if isinstance(rng, random.Random):
+        return random.Random(int.from_bytes(seed_seq.generate_state(4).tobytes(), 'little'))
+    return np.random.Generator(type(rng.bit_generator)(seed_seq))
+
+
+def checkpoint(model, path):
+    """Guarda el estado completo de un modelo (grilla, t, parámetros, contadores y RNG) en `path`."""
+    nombre = type(model).__name__
+    if nombre not in MODELOS:
+        raise TypeError(f'Modelo no soportado para checkpoint: {nombre}')
+
+    meta = {'formato': FORMATO, 'clase': nombre, 'atributos': {}, 'rngs': {}}
+    arrays = {}
+    for k, v in vars(model).items():
+        if k.startswith('_'):
+            # Los atributos privados son cachés que el modelo reconstruye solo
+            continue
+        if isinstance(v, np.ndarray):
+            arrays[k] = v
+        elif isinstance(v, (random.Random, np.random.Generator)):
+            meta_rng, arrays_rng = _estado_rng(v)
+            meta['rngs'][k] = meta_rng
+            for ka, va in arrays_rng.items():
+                arrays[f'{k}.{ka}'] = va
+        elif isinstance(v, (bool, int, float, str)) or v is None:
+            meta['atributos'][k] = v
+        elif isinstance(v, np.generic):
+            meta['atributos'][k] = v.item()
+        else:
+            raise TypeError(f'No se puede guardar el atributo {k!r} de tipo {type(v).__name__}')
+
+    arrays['__meta__'] = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+    # Se escribe a través de un archivo abierto para que numpy no agregue la extensión .npz
+    with open(path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+
+
+def _cargar(path):
+    with np.load(path) as data:
+        meta = json.loads(data['__meta__'].tobytes().decode('utf-8'))
+        arrays = {k: data[k] for k in data.files if k != '__meta__'}
+    if meta.get('formato') != FORMATO:
+        raise ValueError(f'Formato de checkpoint no soportado: {meta.get("formato")}')
+    if meta['clase'] not in MODELOS:
+        raise ValueError(f'Clase desconocida en el checkpoint: {meta["clase"]}')
+    return meta, arrays
+
+
+def _construir(meta, arrays):
+    cls = getattr(importlib.import_module(MODELOS[meta['clase']]), meta['clase'])
+    # Se evita __init__: el estado se repone tal cual fue guardado
+    model = cls.__new__(cls)
+    for k, v in meta['atributos'].items():
+        setattr(model, k, v)
+    for k, v in arrays.items():
+        if '.' not in k:
+            setattr(model, k, v.copy())
+    for k, meta_rng in meta['rngs'].items():
+        prefijo = k + '.'
+        arrays_rng = {ka[len(prefijo):]: va for ka, va in arrays.items() if ka.startswith(prefijo)}
+        setattr(model, k, _crear_rng(meta_rng, arrays_rng))
+    return model
+
+
+def restore(path):
+    """Reconstruye el modelo guardado con `checkpoint`; continúa exactamente donde quedó."""
+    meta, arrays = _cargar(path)
+    return _construir(meta, arrays)
+
+
+def fork(path, n, seed=None):
+    """
+    Crea `n` continuaciones independientes de un mismo checkpoint.
+
+    Cada copia comparte grilla, t, parámetros y contadores, pero sus generadores se
+    vuelven a sembrar con semillas distintas derivadas de `seed` (SeedSequence.spawn),
+    de modo que un calentamiento costoso se ejecuta una sola vez.
+    """
+    meta, arrays = _cargar(path)
+    modelos = []
+    for seed_seq in np.random.SeedSequence(seed).spawn(n):
+        model = _construir(meta, arrays)
+        for k in meta['rngs']:
+            setattr(model, k, _resembrar(getattr(model, k), seed_seq))
+        modelos.append(model)
+    return modelos
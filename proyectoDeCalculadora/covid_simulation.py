@@ -1,44 +1,30 @@
-import random
 import numpy as np
 
+import kernels
+
 class CovidSimulation:
     # States: 0=empty, 1=susceptible, 2=infected, 3=recovered, 4=dead
-    def __init__(self, rows=60, cols=60, init_infected=5, p_infect=0.3, p_recover=0.02, p_die=0.005):
+    def __init__(self, rows=60, cols=60, init_infected=5, p_infect=0.3, p_recover=0.02, p_die=0.005, seed=None):
         self.rows = rows
         self.cols = cols
-        self.grid = np.ones((rows, cols), dtype=int)
+        self.grid = np.ones((rows, cols), dtype=np.int8)
         self.t = 0
         self.p_infect = p_infect
         self.p_recover = p_recover
         self.p_die = p_die
-        for _ in range(init_infected):
-            r = random.randrange(rows)
-            c = random.randrange(cols)
-            self.grid[r, c] = 2
+        # Generador propio para poder guardar/restaurar su estado (checkpoint)
+        self.rng = np.random.default_rng(seed)
+        r = self.rng.integers(rows, size=init_infected)
+        c = self.rng.integers(cols, size=init_infected)
+        self.grid[r, c] = 2
 
     def step(self):
-        new = self.grid.copy()
-        for r in range(self.rows):
-            for c in range(self.cols):
-                state = self.grid[r, c]
-                if state == 1:
-                    neigh = self.grid[max(0, r-1):r+2, max(0, c-1):c+2]
-                    infected_neighbors = np.sum(neigh == 2)
-                    if infected_neighbors > 0:
-                        p = 1 - ((1 - self.p_infect) ** infected_neighbors)
-                        if random.random() < p:
-                            new[r, c] = 2
-                elif state == 2:
-                    if random.random() < self.p_die:
-                        new[r, c] = 4
-                    elif random.random() < self.p_recover:
-                        new[r, c] = 3
-        self.grid = new
+        # Los sorteos se hacen aquí para que ambos backends de kernels den el mismo resultado
+        u1 = self.rng.random(self.grid.shape)
+        u2 = self.rng.random(self.grid.shape)
+        self.grid = kernels.covid_step(self.grid, u1, u2, self.p_infect, self.p_die, self.p_recover)
         self.t += 1
 
     def counts(self):
-        unique, counts = np.unique(self.grid, return_counts=True)
-        d = {k:0 for k in range(5)}
-        for u, c in zip(unique, counts):
-            d[int(u)] = int(c)
-        return d
\ No newline at end of file
+        counts = np.bincount(self.grid.ravel(), minlength=5)
+        return {k: int(counts[k]) for k in range(5)}
\ No newline at end of file
@@ -0,0 +1,235 @@
+"""
+Densidades (PDF), funciones de probabilidad (PMF), distribuciones acumuladas
+(CDF) y momentos analíticos de las distribuciones de RandomGenerators, con los
+mismos nombres de parámetros. Se evalúan de forma vectorizada sobre una grilla
+(p. ej. los bins de un histograma) o sobre bloques de muestras.
+"""
+import math
+
+import numpy as np
+
+DISCRETAS = ('bernoulli', 'binomial', 'poisson')
+
+_lgamma = np.vectorize(math.lgamma, otypes=[float])
+
+_EPS = 1e-15
+_MIN = 1e-300
+_MAX_ITER = 10_000
+
+
+def _uniform(x, a=0.0, b=1.0):
+    if b == a:
+        # Degenerada: toda la masa en un punto
+        return np.where(x == a, np.inf, 0.0)
+    return np.where((x >= a) & (x <= b), 1.0 / (b - a), 0.0)
+
+
+def _exponential(x, lam=1.0):
+    return np.where(x >= 0, lam * np.exp(-lam * np.maximum(x, 0)), 0.0)
+
+
+def _gamma(x, shape, scale=1.0):
+    xp = np.maximum(x, np.finfo(float).tiny)
+    log_pdf = (shape - 1) * np.log(xp) - xp / scale - math.lgamma(shape) - shape * math.log(scale)
+    return np.where(x > 0, np.exp(log_pdf), 0.0)
+
+
+def _erlang(x, k=1, lam=1.0):
+    return _gamma(x, shape=k, scale=1.0 / lam)
+
+
+def _normal(x, mu=0.0, sigma=1.0):
+    z = (x - mu) / sigma
+    return np.exp(-0.5 * z * z) / (sigma * math.sqrt(2 * math.pi))
+
+
+def _weibull(x, k=1.0, lam=1.0):
+    z = np.maximum(x, 0) / lam
+    return np.where(x >= 0, (k / lam) * z ** (k - 1) * np.exp(-z ** k), 0.0)
+
+
+def _bernoulli(x, p=0.5):
+    return np.where(x == 0, 1 - p, np.where(x == 1, p, 0.0))
+
+
+def _binomial(x, n=1, p=0.5):
+    k = np.clip(x, 0, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_pmf = (math.lgamma(n + 1) - _lgamma(k + 1) - _lgamma(n - k + 1)
+                   + k * np.log(p) + (n - k) * np.log1p(-p))
+    pmf = np.nan_to_num(np.exp(log_pmf))
+    # p = 0 o p = 1 concentran toda la masa en un extremo
+    if p == 0:
+        pmf = (k == 0).astype(float)
+    elif p == 1:
+        pmf = (k == n).astype(float)
+    return np.where((x >= 0) & (x <= n) & (x == np.floor(x)), pmf, 0.0)
+
+
+def _poisson(x, lam=1.0):
+    if lam == 0:
+        # λ = 0 concentra toda la masa en k = 0
+        return np.where(x == 0, 1.0, 0.0)
+    k = np.maximum(x, 0)
+    pmf = np.exp(k * math.log(lam) - lam - _lgamma(k + 1))
+    return np.where((x >= 0) & (x == np.floor(x)), pmf, 0.0)
+
+
+def gammainc(a, x, superior=False):
+    """
+    Gamma incompleta regularizada P(a, x) (o Q(a, x) = 1 - P si `superior`),
+    vectorizada en `x`. Serie para x < a + 1 y fracción continua (Lentz) para el
+    resto, como en Numerical Recipes; todos los elementos iteran a la vez.
+    """
+    x = np.asarray(x, dtype=float)
+    p = np.zeros(x.shape)
+    q = np.ones(x.shape)
+    infinito = np.isposinf(x)
+    p[infinito] = 1.0
+    q[infinito] = 0.0
+    positivo = (x > 0) & ~infinito
+    serie = positivo & (x < a + 1)
+    fraccion = positivo & ~serie
+
+    xs = x[serie]
+    if xs.size:
+        termino = np.full(xs.shape, 1.0 / a)
+        suma = termino.copy()
+        for n in range(1, _MAX_ITER):
+            termino *= xs / (a + n)
+            suma += termino
+            if np.all(np.abs(termino) < np.abs(suma) * _EPS):
+                break
+        p[serie] = suma * np.exp(-xs + a * np.log(xs) - math.lgamma(a))
+        q[serie] = 1.0 - p[serie]
+
+    xf = x[fraccion]
+    if xf.size:
+        b = xf + 1.0 - a
+        c = np.full(xf.shape, 1.0 / _MIN)
+        d = 1.0 / b
+        h = d.copy()
+        for i in range(1, _MAX_ITER):
+            an = -i * (i - a)
+            b += 2.0
+            d = an * d + b
+            d[np.abs(d) < _MIN] = _MIN
+            c = b + an / c
+            c[np.abs(c) < _MIN] = _MIN
+            d = 1.0 / d
+            delta = d * c
+            h *= delta
+            if np.all(np.abs(delta - 1.0) < _EPS):
+                break
+        q[fraccion] = h * np.exp(-xf + a * np.log(xf) - math.lgamma(a))
+        p[fraccion] = 1.0 - q[fraccion]
+    return q if superior else p
+
+
+def normal_cdf(z):
+    """Φ(z) de la normal estándar, precisa también en las colas (vía Q(1/2, z²/2))."""
+    z = np.asarray(z, dtype=float)
+    cola = 0.5 * gammainc(0.5, 0.5 * z * z, superior=True)
+    return np.where(z < 0, cola, 1.0 - cola)
+
+
+def _cdf_uniform(x, a=0.0, b=1.0):
+    if b == a:
+        return np.where(x >= a, 1.0, 0.0)
+    return np.clip((x - a) / (b - a), 0.0, 1.0)
+
+
+def _cdf_exponential(x, lam=1.0):
+    return -np.expm1(-lam * np.maximum(x, 0))
+
+
+def _cdf_gamma(x, shape, scale=1.0):
+    return gammainc(shape, np.maximum(x, 0) / scale)
+
+
+def _cdf_erlang(x, k=1, lam=1.0):
+    return _cdf_gamma(x, shape=k, scale=1.0 / lam)
+
+
+def _cdf_normal(x, mu=0.0, sigma=1.0):
+    return normal_cdf((x - mu) / sigma)
+
+
+def _cdf_weibull(x, k=1.0, lam=1.0):
+    return -np.expm1(-(np.maximum(x, 0) / lam) ** k)
+
+
+def _cdf_discreta(pmf):
+    def cdf(x, **params):
+        # Suma acumulada de la PMF sobre 0..max(x), indexada por floor(x)
+        k = np.floor(x)
+        tope = int(max(k.max(initial=0), 0))
+        acumulada = np.minimum(np.cumsum(pmf(np.arange(tope + 1, dtype=float), **params)), 1.0)
+        return np.where(k < 0, 0.0, acumulada[np.clip(k, 0, tope).astype(np.int64)])
+    return cdf
+
+
+DENSIDADES = {
+    'uniform': _uniform,
+    'exponential': _exponential,
+    'erlang': _erlang,
+    'gamma': _gamma,
+    'normal': _normal,
+    'weibull': _weibull,
+    'bernoulli': _bernoulli,
+    'binomial': _binomial,
+    'poisson': _poisson,
+}
+
+
+ACUMULADAS = {
+    'uniform': _cdf_uniform,
+    'exponential': _cdf_exponential,
+    'erlang': _cdf_erlang,
+    'gamma': _cdf_gamma,
+    'normal': _cdf_normal,
+    'weibull': _cdf_weibull,
+    'bernoulli': _cdf_discreta(_bernoulli),
+    'binomial': _cdf_discreta(_binomial),
+    'poisson': _cdf_discreta(_poisson),
+}
+
+
+def _momentos_weibull(k=1.0, lam=1.0):
+    g1 = math.gamma(1 + 1 / k)
+    return lam * g1, lam ** 2 * (math.gamma(1 + 2 / k) - g1 ** 2)
+
+
+# (media, varianza) de cada distribución
+MOMENTOS = {
+    'uniform': lambda a=0.0, b=1.0: ((a + b) / 2, (b - a) ** 2 / 12),
+    'exponential': lambda lam=1.0: (1 / lam, 1 / lam ** 2),
+    'erlang': lambda k=1, lam=1.0: (k / lam, k / lam ** 2),
+    'gamma': lambda shape, scale=1.0: (shape * scale, shape * scale ** 2),
+    'normal': lambda mu=0.0, sigma=1.0: (mu, sigma ** 2),
+    'weibull': _momentos_weibull,
+    'bernoulli': lambda p=0.5: (p, p * (1 - p)),
+    'binomial': lambda n=1, p=0.5: (n * p, n * p * (1 - p)),
+    'poisson': lambda lam=1.0: (lam, lam),
+}
+
+
+def densidad(dist, x, **params):
+    """PDF (continuas) o PMF (discretas) de `dist` evaluada en `x`."""
+    if dist not in DENSIDADES:
+        raise ValueError(f'Distribución no soportada: {dist}')
+    return DENSIDADES[dist](np.asarray(x, dtype=float), **params)
+
+
+def acumulada(dist, x, **params):
+    """CDF de `dist` evaluada en `x`."""
+    if dist not in ACUMULADAS:
+        raise ValueError(f'Distribución no soportada: {dist}')
+    return ACUMULADAS[dist](np.asarray(x, dtype=float), **params)
+
+
+def momentos(dist, **params):
+    """Media y varianza teóricas de `dist`."""
+    if dist not in MOMENTOS:
+        raise ValueError(f'Distribución no soportada: {dist}')
+    return MOMENTOS[dist](**params)
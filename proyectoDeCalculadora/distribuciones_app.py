@@ -1,41 +1,168 @@
+import math
+import queue
+import random
 import tkinter as tk
 from tkinter import ttk, messagebox
+from concurrent.futures import ProcessPoolExecutor
 
-import matplotlib
+import numpy as np
 
-matplotlib.use('TkAgg')
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from motor import RandomGenerators
+from densidades import DISCRETAS, densidad
+from fuentes_uniformes import FUENTES, INVERSA
 
-from random_generators import RandomGenerators  # Asumo que tienes este módulo
+# Tamaño de cada bloque de muestras enviado al pool de procesos
+TAM_BLOQUE = 50_000
+# Intervalo (ms) con el que la interfaz revisa los bloques terminados
+INTERVALO_SONDEO = 50
 
 
-def plot_histogram(data, ax, bins=50, title='', xlabel='x',
-                   facecolor='#555555', text_color='#f0f0f0',
-                   hist_color='peru', hist_edge='saddlebrown'):
+def _generar_bloque(dist, kwargs, n, seed, fuente='iid'):
     """
-    Función de ayuda para graficar un histograma con estilo oscuro.
+    Genera `n` muestras de `dist` en un proceso de trabajo.
+    Devuelve (muestras, error estándar de su media según la fuente de uniformes).
+    """
+    # Los generadores usan el estado global de numpy y de random
+    np.random.seed(seed)
+    random.seed(seed)
+    if dist in INVERSA:
+        uniformes = FUENTES[fuente](seed=seed)
+        data = getattr(RandomGenerators, dist)(size=n, rng=uniformes, **kwargs)
+        return data, uniformes.error_estandar(data)
+    data = getattr(RandomGenerators, dist)(size=n, **kwargs)
+    return data, float(np.std(data, ddof=1) / math.sqrt(n)) if n > 1 else 0.0
+
+
+class Histogram:
     """
-    ax.clear()
-    ax.set_facecolor(facecolor)  # Fondo del área de la gráfica (gris oscuro)
+    Histograma acumulado por bloques: cada bloque se cuenta una sola vez con
+    np.bincount y las muestras no se guardan.
 
-    # Graficar el histograma con colores naranja
-    ax.hist(data, bins=bins, density=True, alpha=0.8, color=hist_color, edgecolor=hist_edge)
+    Las distribuciones discretas usan un bin por entero. Las continuas usan bins
+    de ancho fijo que se extienden para cubrir valores nuevos y se fusionan de a
+    pares cuando superan el doble de `bins`, así el número de barras queda acotado.
+    """
 
-    # Colores del texto (título y etiquetas)
-    ax.set_title(title, color=text_color)
-    ax.set_xlabel(xlabel, color=text_color)
-    ax.set_ylabel('Densidad', color=text_color)
+    def __init__(self, bins=50, discrete=False):
+        self.bins = bins
+        self.discrete = discrete
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.lo = 0.0
+        self.width = 1.0
+        self.total = 0
+
+    def _grow(self, n):
+        if n > self.counts.size:
+            self.counts = np.concatenate([self.counts, np.zeros(n - self.counts.size, dtype=np.int64)])
+
+    def add(self, data):
+        data = np.asarray(data).ravel()
+        if data.size == 0:
+            return
+        self.total += data.size
 
-    # Colores de los ejes (ticks y bordes)
-    ax.tick_params(axis='x', colors=text_color)
-    ax.tick_params(axis='y', colors=text_color)
+        if self.discrete:
+            counts = np.bincount(data.astype(np.intp))
+            self._grow(counts.size)
+            self.counts[:counts.size] += counts
+            return
 
-    # Cambiar el color de los bordes del gráfico (spines)
-    ax.spines['top'].set_color(text_color)
-    ax.spines['bottom'].set_color(text_color)
-    ax.spines['left'].set_color(text_color)
-    ax.spines['right'].set_color(text_color)
+        xmin, xmax = float(data.min()), float(data.max())
+        if self.counts.size == 0:
+            self.lo = xmin
+            self.width = (xmax - xmin) / self.bins if xmax > xmin else 1.0
+            self.counts = np.zeros(self.bins, dtype=np.int64)
+        if xmin < self.lo:
+            k = math.ceil((self.lo - xmin) / self.width)
+            self.lo -= k * self.width
+            self.counts = np.concatenate([np.zeros(k, dtype=np.int64), self.counts])
+        self._grow(math.ceil((xmax - self.lo) / self.width))
+        while self.counts.size > 2 * self.bins:
+            self._grow(self.counts.size + self.counts.size % 2)
+            self.counts = self.counts.reshape(-1, 2).sum(axis=1)
+            self.width *= 2
+
+        idx = ((data - self.lo) // self.width).astype(np.intp)
+        # El borde derecho cae en el último bin, igual que en np.histogram
+        np.clip(idx, 0, self.counts.size - 1, out=idx)
+        self.counts += np.bincount(idx, minlength=self.counts.size)
+
+    def bars(self):
+        """Devuelve (borde izquierdo, ancho, densidad) de cada barra."""
+        n = np.arange(self.counts.size)
+        if self.discrete:
+            left, width = n - 0.5, 1.0
+        else:
+            left, width = self.lo + n * self.width, self.width
+        density = self.counts / (max(self.total, 1) * width)
+        return left, width, density
+
+
+class HistogramPlot:
+    """
+    Dibuja un Histogram con estilo oscuro. Mientras la grilla de bins no cambia,
+    las barras existentes se actualizan con set_height en vez de recrearse.
+    """
+
+    def __init__(self, ax, facecolor='#555555', text_color='#f0f0f0',
+                 hist_color='peru', hist_edge='saddlebrown', overlay_color='#f0f0f0'):
+        self.ax = ax
+        self.text_color = text_color
+        self.hist_color = hist_color
+        self.hist_edge = hist_edge
+        self.overlay_color = overlay_color
+        self._bars = None
+        self._geometry = None
+        self._overlay = None
+
+        ax.clear()
+        ax.set_facecolor(facecolor)  # Fondo del área de la gráfica (gris oscuro)
+        ax.set_ylabel('Densidad', color=text_color)
+
+        # Colores de los ejes (ticks y bordes)
+        ax.tick_params(axis='x', colors=text_color)
+        ax.tick_params(axis='y', colors=text_color)
+        for spine in ax.spines.values():
+            spine.set_color(text_color)
+
+    def update(self, hist, title='', xlabel='x', overlay=None):
+        """Actualiza las barras; `overlay` es un par (x, y) con la densidad teórica o None."""
+        left, width, heights = hist.bars()
+        geometry = (left.size, float(left[0]) if left.size else None, width)
+        if geometry != self._geometry:
+            if self._bars is not None:
+                self._bars.remove()
+            self._bars = self.ax.bar(left, heights, width=width, align='edge', alpha=0.8,
+                                     color=self.hist_color, edgecolor=self.hist_edge)
+            self._geometry = geometry
+        else:
+            for bar, h in zip(self._bars, heights):
+                bar.set_height(h)
+
+        if overlay is None:
+            if self._overlay is not None:
+                self._overlay.remove()
+                self._overlay = None
+        elif self._overlay is None:
+            self._overlay, = self.ax.plot(*overlay, color=self.overlay_color,
+                                          marker='o' if hist.discrete else None)
+        else:
+            self._overlay.set_data(*overlay)
+            self._overlay.set_marker('o' if hist.discrete else 'None')
+
+        self.ax.set_title(title, color=self.text_color)
+        self.ax.set_xlabel(xlabel, color=self.text_color)
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+
+def plot_histogram(data, ax, bins=50, title='', xlabel='x', discrete=False, **style):
+    """
+    Función de ayuda para graficar un histograma con estilo oscuro.
+    """
+    hist = Histogram(bins=bins, discrete=discrete)
+    hist.add(data)
+    HistogramPlot(ax, **style).update(hist, title=title, xlabel=xlabel)
 
 
 class DistribucionesApp:
@@ -86,6 +213,10 @@ class DistribucionesApp:
                              relief='flat',
                              padding=5)
 
+        # Estilo para Checkbutton
+        self.style.configure('TCheckbutton', background=frame_bg_color, foreground=text_color)
+        self.style.map('TCheckbutton', background=[('active', frame_bg_color)])
+
         # Estilo para Button (mantenemos el naranja)
         self.style.configure('TButton',
                              background=button_bg_color,
@@ -119,8 +250,38 @@ class DistribucionesApp:
         self.params_entry.insert(0, 'mu=0,sigma=1')
         self.params_entry.pack(fill='x')
 
+        ttk.Label(left, text='Uniformes (transformada inversa):', style='TLabel').pack(anchor='w', pady=(10, 0))
+        self.fuente_var = tk.StringVar(value='iid')
+        ttk.Combobox(left, values=list(FUENTES), textvariable=self.fuente_var, state='readonly',
+                     style='TCombobox').pack(fill='x')
+
         ttk.Button(left, text='Generar y graficar', command=self._generate_and_plot, style='TButton').pack(fill='x',
                                                                                                            pady=5)
+        ttk.Button(left, text='Cancelar', command=self._cancel, style='TButton').pack(fill='x')
+
+        self.overlay_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(left, text='Densidad teórica', variable=self.overlay_var,
+                        style='TCheckbutton').pack(anchor='w', pady=(5, 0))
+
+        self.progress = ttk.Progressbar(left, mode='determinate')
+        self.progress.pack(fill='x', pady=(10, 0))
+        self.status_var = tk.StringVar(value='')
+        ttk.Label(left, textvariable=self.status_var, style='TLabel').pack(anchor='w')
+
+        # Estado de la generación en segundo plano. Cada solicitud recibe un id;
+        # los bloques de solicitudes anteriores se descartan (gana la última).
+        self._pool = None
+        self._gen_id = 0
+        self._gen = None
+        self._futures = []
+        self._results = queue.Queue()
+        self._polling = False
+
+        # Matplotlib se importa recién aquí para no pagar su costo al importar el módulo
+        import matplotlib
+        matplotlib.use('TkAgg')
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
         # Matplotlib Figure con fondo oscuro
         fig = Figure(figsize=(7, 5), facecolor=frame_bg_color)
@@ -129,7 +290,8 @@ class DistribucionesApp:
         self.canvas.get_tk_widget().pack(fill='both', expand=True)
 
         # Inicializa la gráfica vacía con el estilo oscuro
-        plot_histogram([], self.ax, title='Seleccione una distribución y genere la gráfica')
+        self.hist_plot = HistogramPlot(self.ax)
+        self.hist_plot.update(Histogram(), title='Seleccione una distribución y genere la gráfica')
         self.canvas.draw()
 
     def _parse_params(self, text):
@@ -157,6 +319,60 @@ class DistribucionesApp:
                         d[p] = p
         return d
 
+    def _configure(self, dist, params):
+        """Traduce los parámetros del usuario a (kwargs del generador, título)."""
+        if dist == 'uniform':
+            a = params.get('a', 0.0)
+            b = params.get('b', 1.0)
+            if b < a:
+                raise ValueError('b debe ser mayor o igual que a')
+            return {'a': a, 'b': b}, f'Uniforme U({a},{b})'
+        elif dist == 'exponential':
+            lam = params.get('lam', params.get('lambda', 1.0))
+            if lam <= 0:
+                raise ValueError('λ debe ser positivo')
+            return {'lam': lam}, f'Exponencial (λ={lam})'
+        elif dist == 'erlang':
+            k = int(params.get('k', 2))
+            lam = params.get('lam', 1.0)
+            if k <= 0:
+                raise ValueError('k debe ser entero positivo')
+            if lam <= 0:
+                raise ValueError('λ debe ser positivo')
+            return {'k': k, 'lam': lam}, f'Erlang k={k}, λ={lam}'
+        elif dist == 'gamma':
+            shape = params.get('shape', 2.0)
+            scale = params.get('scale', 1.0)
+            if shape <= 0:
+                raise ValueError('shape must be > 0')
+            return {'shape': shape, 'scale': scale}, f'Gamma(shape={shape}, scale={scale})'
+        elif dist == 'normal':
+            mu = params.get('mu', 0.0)
+            sigma = params.get('sigma', 1.0)
+            return {'mu': mu, 'sigma': sigma}, f'Normal N({mu},{sigma ** 2})'
+        elif dist == 'weibull':
+            k = params.get('k', 1.5)
+            lam = params.get('lam', 1.0)
+            return {'k': k, 'lam': lam}, f'Weibull k={k}, λ={lam}'
+        elif dist == 'bernoulli':
+            p = params.get('p', 0.5)
+            return {'p': p}, f'Bernoulli p={p}'
+        elif dist == 'binomial':
+            nn = int(params.get('n', 10))
+            p = params.get('p', 0.5)
+            return {'n': nn, 'p': p}, f'Binomial n={nn}, p={p}'
+        elif dist == 'poisson':
+            lam = params.get('lam', 1.0)
+            if lam < 0:
+                raise ValueError('λ debe ser no negativo')
+            return {'lam': lam}, f'Poisson λ={lam}'
+        raise ValueError('Distribución no soportada')
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor()
+        return self._pool
+
     def _generate_and_plot(self):
         dist = self.dist_var.get()
         try:
@@ -167,59 +383,115 @@ class DistribucionesApp:
 
         params = self._parse_params(self.params_entry.get())
         try:
-            if dist == 'uniform':
-                a = params.get('a', 0.0)
-                b = params.get('b', 1.0)
-                data = RandomGenerators.uniform(a=a, b=b, size=n)
-                plot_histogram(data, self.ax, bins=50, title=f'Uniforme U({a},{b})')
-            elif dist == 'exponential':
-                lam = params.get('lam', params.get('lambda', 1.0))
-                data = RandomGenerators.exponential(lam=lam, size=n)
-                plot_histogram(data, self.ax, bins=50, title=f'Exponencial (λ={lam})')
-            elif dist == 'erlang':
-                k = int(params.get('k', 2))
-                lam = params.get('lam', 1.0)
-                data = RandomGenerators.erlang(k=k, lam=lam, size=n)
-                plot_histogram(data, self.ax, bins=50, title=f'Erlang k={k}, λ={lam}')
-            elif dist == 'gamma':
-                shape = params.get('shape', 2.0)
-                scale = params.get('scale', 1.0)
-                data = RandomGenerators.gamma(shape=shape, scale=scale, size=n)
-                plot_histogram(data, self.ax, bins=50, title=f'Gamma(shape={shape}, scale={scale})')
-            elif dist == 'normal':
-                mu = params.get('mu', 0.0)
-                sigma = params.get('sigma', 1.0)
-                data = RandomGenerators.normal(mu=mu, sigma=sigma, size=n)
-                plot_histogram(data, self.ax, bins=50, title=f'Normal N({mu},{sigma ** 2})')
-            elif dist == 'weibull':
-                k = params.get('k', 1.5)
-                lam = params.get('lam', 1.0)
-                data = RandomGenerators.weibull(k=k, lam=lam, size=n)
-                plot_histogram(data, self.ax, bins=50, title=f'Weibull k={k}, λ={lam}')
-            elif dist == 'bernoulli':
-                p = params.get('p', 0.5)
-                data = RandomGenerators.bernoulli(p=p, size=n)
-                plot_histogram(data, self.ax, bins=2, title=f'Bernoulli p={p}')
-            elif dist == 'binomial':
-                nn = int(params.get('n', 10))
-                p = params.get('p', 0.5)
-                data = RandomGenerators.binomial(n=nn, p=p, size=n)
-                plot_histogram(data, self.ax, bins=range(0, nn + 2), title=f'Binomial n={nn}, p={p}')
-            elif dist == 'poisson':
-                lam = params.get('lam', 1.0)
-                data = RandomGenerators.poisson(lam=lam, size=n)
-                plot_histogram(data, self.ax, bins=range(0, int(max(data)) + 2), title=f'Poisson λ={lam}')
-            else:
-                raise ValueError('Distribución no soportada')
+            kwargs, title = self._configure(dist, params)
+        except Exception as e:
+            messagebox.showerror('Error', f'Error generando la distribución: {e}')
+            return
 
-            self.canvas.draw()
+        # Una nueva solicitud reemplaza a la que esté en curso
+        self._cancel(quiet=True)
+        self._gen_id += 1
+        # Bloques de igual tamaño (difieren a lo sumo en 1): el primero en llegar fija
+        # la grilla de bins, así que no puede ser un resto de pocas muestras
+        bloques = -(-n // TAM_BLOQUE)
+        sizes = [n // bloques + (i < n % bloques) for i in range(bloques)]
+        self._gen = {'id': self._gen_id, 'dist': dist, 'kwargs': kwargs, 'title': title,
+                     'hist': Histogram(bins=50, discrete=dist in DISCRETAS), 'done': 0, 'total': len(sizes),
+                     'suma': 0.0, 'varianza': 0.0}
+
+        fuente = self.fuente_var.get()
+
+        pool = self._get_pool()
+        for size, seed_seq in zip(sizes, np.random.SeedSequence().spawn(len(sizes))):
+            future = pool.submit(_generar_bloque, dist, kwargs, size, int(seed_seq.generate_state(1)[0]), fuente)
+            future.add_done_callback(lambda f, gen_id=self._gen_id: self._results.put((gen_id, f)))
+            self._futures.append(future)
+
+        self.progress.configure(maximum=len(sizes), value=0)
+        self.status_var.set(f'Generando 0/{len(sizes)} bloques...')
+        if not self._polling:
+            self._polling = True
+            self.root.after(INTERVALO_SONDEO, self._poll)
+
+    def _cancel(self, quiet=False):
+        """Cancela la generación en curso; los bloques que ya estén corriendo se descartan."""
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+        if self._gen is not None and not quiet:
+            self.status_var.set(f'Cancelado ({self._gen["done"]}/{self._gen["total"]} bloques)')
+        self._gen = None
+        self._gen_id += 1
+
+    def _poll(self):
+        """Recoge los bloques terminados (en el hilo de Tk) y redibuja una sola vez."""
+        try:
+            updated = False
+            while True:
+                try:
+                    gen_id, future = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                if self._gen is None or gen_id != self._gen['id'] or future.cancelled():
+                    continue
+                # Un error del proceso de trabajo se relanza aquí
+                data, error = future.result()
+                # Cada bloque es una réplica independiente: la media global pondera por
+                # tamaño y las varianzas de las medias se suman con el peso al cuadrado
+                self._gen['hist'].add(data)
+                self._gen['suma'] += float(np.sum(data))
+                self._gen['varianza'] += (data.size * error) ** 2
+                self._gen['done'] += 1
+                updated = True
+            if updated:
+                self._plot_partial()
         except Exception as e:
+            self._cancel(quiet=True)
+            self.status_var.set('Error')
             messagebox.showerror('Error', f'Error generando la distribución: {e}')
+        finally:
+            # Siempre se reprograma o se libera el sondeo, aunque falle un bloque o el dibujo
+            if self._gen is not None:
+                self.root.after(INTERVALO_SONDEO, self._poll)
+            else:
+                self._polling = False
+
+    def _plot_partial(self):
+        gen = self._gen
+        done = gen['done']
+        hist = gen['hist']
+        title = gen['title'] if done == gen['total'] else f'{gen["title"]} ({done}/{gen["total"]})'
+        overlay = None
+        if self.overlay_var.get():
+            # Densidad teórica evaluada sobre la misma grilla de bins
+            left, width, _ = hist.bars()
+            x = left + width / 2
+            overlay = (x, densidad(gen['dist'], x, **gen['kwargs']))
+        self.hist_plot.update(hist, title=title, overlay=overlay)
+        self.canvas.draw_idle()
+
+        self.progress.configure(value=done)
+        if done == gen['total']:
+            media = gen['suma'] / hist.total
+            error = math.sqrt(gen['varianza']) / hist.total
+            self.status_var.set(f'Listo: {hist.total} muestras\nmedia = {media:.6g} ± {error:.2g}')
+            self._gen = None
+            self._futures = []
+        else:
+            self.status_var.set(f'Generando {done}/{gen["total"]} bloques...')
+
+    def close(self):
+        """Detiene la generación y cierra el pool de procesos."""
+        self._cancel(quiet=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
 
 
 def main():
     root = tk.Tk()
     app = DistribucionesApp(root)
+    root.protocol("WM_DELETE_WINDOW", app.close)
     root.mainloop()
 
 
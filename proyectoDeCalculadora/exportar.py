@@ -0,0 +1,227 @@
+"""
+Exportación de animaciones sin interfaz gráfica.
+
+Uso: python exportar.py covid salida.mp4 --frames 5000 --params '{"rows": 1000, "cols": 1000}'
+                        [--seed S] [--cada K] [--fps 30] [--escala E] [--workers N]
+
+El modelo (mismos nombres y parámetros que lotes.py) avanza en el proceso
+principal y cada estado se traduce a color con una tabla de paleta
+(PALETAS[clase][estado]); no se usa matplotlib por cuadro.
+
+- carpeta (cualquier ruta sin .mp4/.gif): secuencia PNG de color indexado
+  (frame_00000.png, ...) codificada con zlib por un pool de procesos.
+- .mp4: los cuadros RGB se envían a ffmpeg por una tubería; requiere ffmpeg en el PATH.
+- .gif: se arma con Pillow (si está instalado); guarda todos los cuadros en
+  memoria, así que conviene para animaciones cortas.
+
+Los modelos 1D se exportan como diagrama espacio-tiempo con las últimas
+`alto` generaciones.
+"""
+import argparse
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import time
+import zlib
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from lotes import crear_modelo
+
+# Mismos colores que simulaciones_app.py, por código de estado
+_FONDO = (0x44, 0x44, 0x44)
+_TEXTO = (0xf0, 0xf0, 0xf0)
+_VIDA = [_FONDO, _TEXTO]
+_COVID = [_FONDO, _FONDO, (255, 0, 0), (144, 238, 144), (128, 128, 128)]
+PALETAS = {
+    'GameOfLife1D': np.array(_VIDA, dtype=np.uint8),
+    'GameOfLife2D': np.array(_VIDA, dtype=np.uint8),
+    'CovidSimulation': np.array(_COVID, dtype=np.uint8),
+    # SEIR agrega el estado 5 (expuesto)
+    'CovidSEIRSimulation': np.array(_COVID + [(255, 165, 0)], dtype=np.uint8),
+}
+
+_FIRMA_PNG = b'\x89PNG\r\n\x1a\n'
+
+
+def _chunk(tipo, datos):
+    return struct.pack('>I', len(datos)) + tipo + datos + struct.pack('>I', zlib.crc32(tipo + datos))
+
+
+def _empaquetar(indices, bits):
+    """Empaqueta 8 // bits píxeles por byte (el primero en los bits altos), como pide PNG."""
+    if bits == 8:
+        return indices
+    por_byte = 8 // bits
+    alto, ancho = indices.shape
+    relleno = -ancho % por_byte
+    if relleno:
+        indices = np.pad(indices, ((0, 0), (0, relleno)))
+    grupos = indices.reshape(alto, -1, por_byte)
+    desplazamientos = np.arange(8 - bits, -1, -bits, dtype=np.uint8)
+    return np.bitwise_or.reduce(grupos << desplazamientos, axis=2).astype(np.uint8)
+
+
+def png_indexado(indices, paleta, nivel=3):
+    """
+    Codifica una imagen de índices uint8 (alto, ancho) como PNG con paleta, con
+    la menor profundidad (1, 2, 4 u 8 bits) que alcanza para la paleta: menos
+    bytes que comprimir y archivos más chicos.
+    """
+    alto, ancho = indices.shape
+    bits = next(b for b in (1, 2, 4, 8) if len(paleta) <= 2 ** b)
+    empaquetado = _empaquetar(indices, bits)
+    filas = np.zeros((alto, empaquetado.shape[1] + 1), dtype=np.uint8)  # byte de filtro 0 por fila
+    filas[:, 1:] = empaquetado
+    cabecera = struct.pack('>IIBBBBB', ancho, alto, bits, 3, 0, 0, 0)
+    return (_FIRMA_PNG + _chunk(b'IHDR', cabecera) + _chunk(b'PLTE', paleta.tobytes())
+            + _chunk(b'IDAT', zlib.compress(filas.tobytes(), nivel)) + _chunk(b'IEND', b''))
+
+
+def _ampliar(indices, escala):
+    if escala == 1:
+        return indices
+    return np.repeat(np.repeat(indices, escala, axis=0), escala, axis=1)
+
+
+def _escribir_png(ruta, indices, paleta, escala, nivel):
+    """Tarea del pool: amplía, codifica y escribe un cuadro."""
+    with open(ruta, 'wb') as f:
+        f.write(png_indexado(_ampliar(indices, escala), paleta, nivel))
+
+
+def cuadros(model, frames, cada=1, alto=None):
+    """Genera `frames` imágenes de estados uint8, avanzando `cada` pasos entre cuadros."""
+    if hasattr(model, 'grid'):
+        for i in range(frames):
+            if i:
+                for _ in range(cada):
+                    model.step()
+            # Siempre una copia: algunos modelos (SEIR) modifican la grilla en su lugar
+            yield model.grid.astype(np.uint8)
+    elif hasattr(model, 'length'):
+        # 1D: ventana deslizante con las últimas `alto` generaciones
+        alto = alto or model.length
+        historia = deque([np.zeros(model.length, dtype=np.uint8)] * alto, maxlen=alto)
+        for i in range(frames):
+            if i:
+                for _ in range(cada):
+                    model.step()
+            historia.append(model.state.astype(np.uint8))
+            yield np.array(historia)
+    else:
+        raise TypeError(f'{type(model).__name__} no tiene grilla para exportar')
+
+
+def _exportar_png(imagenes, carpeta, paleta, escala, nivel, workers, log):
+    os.makedirs(carpeta, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pendientes = set()
+        for i, indices in enumerate(imagenes):
+            # Cantidad acotada de cuadros en vuelo para no acumular memoria
+            if len(pendientes) >= 2 * workers:
+                hechos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in hechos:
+                    futuro.result()
+            ruta = os.path.join(carpeta, f'frame_{i:05d}.png')
+            pendientes.add(pool.submit(_escribir_png, ruta, indices, paleta, escala, nivel))
+            log(i)
+        for futuro in wait(pendientes).done:
+            futuro.result()
+
+
+def _exportar_mp4(imagenes, path, paleta, escala, fps, log):
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        raise RuntimeError('Para exportar MP4 hace falta ffmpeg en el PATH')
+    proceso = None
+    try:
+        for i, indices in enumerate(imagenes):
+            rgb = paleta[_ampliar(indices, escala)]
+            if proceso is None:
+                alto, ancho = rgb.shape[:2]
+                proceso = subprocess.Popen(
+                    [ffmpeg, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                     '-s', f'{ancho}x{alto}', '-r', str(fps), '-i', '-',
+                     # yuv420p exige dimensiones pares
+                     '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-c:v', 'libx264', '-pix_fmt', 'yuv420p', path],
+                    stdin=subprocess.PIPE)
+            proceso.stdin.write(rgb.tobytes())
+            log(i)
+    finally:
+        if proceso is not None:
+            proceso.stdin.close()
+            if proceso.wait() != 0:
+                raise RuntimeError(f'ffmpeg terminó con código {proceso.returncode}')
+
+
+def _exportar_gif(imagenes, path, paleta, escala, fps, log):
+    try:
+        from PIL import Image
+    except ImportError:
+        raise RuntimeError('Para exportar GIF hace falta Pillow (pip install pillow)')
+    lista = []
+    for i, indices in enumerate(imagenes):
+        # putpalette convierte la imagen de índices (modo L) a modo P
+        imagen = Image.fromarray(_ampliar(indices, escala))
+        imagen.putpalette(paleta.tobytes())
+        lista.append(imagen)
+        log(i)
+    lista[0].save(path, save_all=True, append_images=lista[1:], duration=round(1000 / fps), loop=0)
+
+
+def exportar(model, path, frames, fps=30, escala=1, cada=1, workers=None, nivel=3, alto=None, log=None):
+    """
+    Exporta `frames` cuadros de `model` a `path` (carpeta PNG, .mp4 o .gif).
+    El cuadro 0 es el estado actual; entre cuadros se avanzan `cada` pasos.
+    """
+    nombre = type(model).__name__
+    if nombre not in PALETAS:
+        raise TypeError(f'Modelo no soportado para exportar: {nombre}')
+    paleta = PALETAS[nombre]
+    if log is None:
+        t0 = time.perf_counter()
+
+        def log(i):
+            if (i + 1) % 100 == 0 or i + 1 == frames:
+                print(f'[{i + 1}/{frames}] {time.perf_counter() - t0:.1f} s', flush=True)
+    imagenes = cuadros(model, frames, cada=cada, alto=alto)
+    if path.endswith('.mp4'):
+        _exportar_mp4(imagenes, path, paleta, escala, fps, log)
+    elif path.endswith('.gif'):
+        _exportar_gif(imagenes, path, paleta, escala, fps, log)
+    else:
+        _exportar_png(imagenes, path, paleta, escala, nivel, workers, log)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Exporta una simulación como PNG, MP4 o GIF.')
+    parser.add_argument('modelo', choices=['life2d', 'life1d', 'covid', 'seir'])
+    parser.add_argument('salida', help='Carpeta para PNG, o archivo .mp4 / .gif')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--params', default='{}', help='Parámetros del modelo en JSON (como en lotes.py)')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--cada', type=int, default=1, help='Pasos del modelo entre cuadros')
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--escala', type=int, default=1, help='Píxeles por celda')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos para codificar PNG')
+    args = parser.parse_args(argv)
+
+    try:
+        model = crear_modelo(args.modelo, json.loads(args.params), args.seed)
+        exportar(model, args.salida, args.frames, fps=args.fps, escala=args.escala,
+                 cada=args.cada, workers=args.workers)
+    except (ValueError, TypeError, RuntimeError) as e:
+        print('Error:', e, file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
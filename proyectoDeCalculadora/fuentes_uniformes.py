@@ -0,0 +1,203 @@
+"""
+Fuentes de uniformes para reducir la varianza de los generadores por
+transformada inversa de RandomGenerators (uniform, exponential, weibull, erlang).
+
+Cada fuente tiene un método random(size), así que se pasa como `rng`:
+
+    fuente = UniformesSobol(seed=1)
+    x = RandomGenerators.exponential(lam=2.0, size=4096, rng=fuente)
+    media, error = x.mean(), fuente.error_estandar(x)
+
+`error_estandar(valores)` estima el error estándar de la media de valores
+calculados fila a fila sobre el último lote sorteado (p. ej. f(x)). Las fuentes
+estratificadas (LHS y Sobol) sortean `replicas` bloques independientes y
+estiman el error a partir de la dispersión entre bloques.
+"""
+import numpy as np
+
+from random_generators import RandomGenerators
+
+# Números de dirección de Joe y Kuo (new-joe-kuo-6.21201) para las dimensiones 2..21:
+# (grado s, coeficientes a, m_1..m_s). La dimensión 1 es la secuencia de van der Corput.
+_JOE_KUO = [
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+]
+MAX_DIM_SOBOL = len(_JOE_KUO) + 1
+_BITS = 32
+
+
+# Peso de cada dígito binario, del más significativo (2^-1) al menos significativo
+_PESOS = np.uint64(1) << np.arange(_BITS - 1, -1, -1, dtype=np.uint64)
+
+
+def _paridad(x):
+    """Paridad (0/1) de la cantidad de bits en uno de cada elemento uint64."""
+    bits = np.unpackbits(x[..., None].view(np.uint8), axis=-1)
+    return (bits.sum(axis=-1) & 1).astype(np.uint64)
+
+
+def _forma(size):
+    """Devuelve (n, d, forma) para size = n o size = (n, d1, d2, ...)."""
+    forma = (int(size),) if np.isscalar(size) else tuple(int(s) for s in size)
+    return forma[0], int(np.prod(forma[1:], dtype=np.int64)), forma
+
+
+def _direcciones(dim):
+    """Números de dirección (uint64 de 32 bits útiles) para cada dimensión: (dim, _BITS)."""
+    if dim > MAX_DIM_SOBOL:
+        raise ValueError(f'Sobol admite hasta {MAX_DIM_SOBOL} dimensiones')
+    v = np.zeros((dim, _BITS), dtype=np.uint64)
+    v[0] = [1 << (_BITS - 1 - b) for b in range(_BITS)]
+    for d in range(1, dim):
+        s, a, m = _JOE_KUO[d - 1]
+        mm = list(m)
+        for b in range(s, _BITS):
+            x = mm[b - s] ^ (mm[b - s] << s)
+            for k in range(1, s):
+                if (a >> (s - 1 - k)) & 1:
+                    x ^= mm[b - k] << k
+            mm.append(x)
+        v[d] = [mm[b] << (_BITS - 1 - b) for b in range(_BITS)]
+    return v
+
+
+class UniformesIID:
+    """Uniformes independientes (Monte Carlo simple), como referencia."""
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def random(self, size):
+        return self.rng.random(size)
+
+    def error_estandar(self, valores):
+        valores = np.asarray(valores, dtype=float)
+        # Con una sola muestra no hay varianza que estimar, igual que en _generar_bloque
+        if valores.size < 2:
+            return 0.0
+        return float(valores.std(ddof=1) / np.sqrt(valores.size))
+
+
+class UniformesAntiteticas:
+    """Pares antitéticos: la segunda mitad del lote es 1 - u de la primera."""
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def random(self, size):
+        n, _, forma = _forma(size)
+        u = self.rng.random(((n + 1) // 2,) + forma[1:])
+        return np.concatenate([u, 1.0 - u])[:n]
+
+    def error_estandar(self, valores):
+        valores = np.asarray(valores, dtype=float)
+        m = valores.size // 2
+        if m < 2:
+            return 0.0
+        # Cada par (u, 1 - u) aporta una observación independiente: su promedio
+        pares = (valores[:m] + valores[(valores.size + 1) // 2:][:m]) / 2
+        return float(pares.std(ddof=1) / np.sqrt(m))
+
+
+class _PorReplicas:
+    """Base de las fuentes que sortean `replicas` bloques independientes."""
+
+    def __init__(self, seed=None, replicas=8):
+        if replicas < 2:
+            raise ValueError('Se necesitan al menos 2 réplicas para estimar el error')
+        self.rng = np.random.default_rng(seed)
+        self.replicas = replicas
+
+    def random(self, size):
+        n, d, forma = _forma(size)
+        bloques = [self._bloque(m, d) for m in self._tamanos(n)]
+        return np.concatenate(bloques).reshape(forma)
+
+    def _tamanos(self, n):
+        r = min(self.replicas, n)
+        return [n // r + (i < n % r) for i in range(r)]
+
+    def error_estandar(self, valores):
+        valores = np.asarray(valores, dtype=float)
+        if valores.size < 2:
+            return 0.0
+        tamanos = self._tamanos(valores.size)
+        medias = np.array([b.mean() for b in np.split(valores, np.cumsum(tamanos)[:-1])])
+        return float(medias.std(ddof=1) / np.sqrt(len(medias)))
+
+
+class UniformesLHS(_PorReplicas):
+    """Hipercubo latino: en cada dimensión, un punto por cada uno de los m estratos."""
+
+    def _bloque(self, m, d):
+        estratos = self.rng.permuted(np.tile(np.arange(m), (d, 1)), axis=1).T
+        return (estratos + self.rng.random((m, d))) / m
+
+
+class UniformesSobol(_PorReplicas):
+    """
+    Secuencia de Sobol aleatorizada (scrambling lineal de matriz + desplazamiento
+    digital aleatorio). Rinde mejor con bloques de tamaño potencia de 2.
+    """
+
+    def _bloque(self, m, d):
+        v = _direcciones(d)
+        # Scrambling: cada dígito pasa a ser combinación de él y los más significativos
+        # (matriz triangular inferior aleatoria con unos en la diagonal)
+        filas = self.rng.integers(0, 2, size=(d, _BITS, _BITS), dtype=np.uint64)
+        filas = np.tril(filas, -1) | np.eye(_BITS, dtype=np.uint64)
+        mascaras = (filas * _PESOS).sum(axis=2, dtype=np.uint64)             # (d, dígito)
+        digitos = _paridad(v[:, :, None] & mascaras[:, None, :])           # (d, b, dígito)
+        v = (digitos * _PESOS).sum(axis=2, dtype=np.uint64)
+
+        # Puntos en orden de código Gray: x_i = XOR de v_b para cada bit b de gray(i)
+        i = np.arange(m, dtype=np.uint64)
+        gray = i ^ (i >> np.uint64(1))
+        x = np.zeros((m, d), dtype=np.uint64)
+        for b in range(max(int(m - 1).bit_length(), 1)):
+            activo = ((gray >> np.uint64(b)) & np.uint64(1)).astype(bool)
+            x[activo] ^= v[:, b]
+        x ^= self.rng.integers(0, 2 ** _BITS, size=d, dtype=np.uint64)
+        return (x.astype(float) + 0.5) * 2.0 ** -_BITS
+
+
+FUENTES = {
+    'iid': UniformesIID,
+    'antitetica': UniformesAntiteticas,
+    'lhs': UniformesLHS,
+    'sobol': UniformesSobol,
+}
+
+# Generadores que se calculan como transformación de uniformes y aceptan `rng`
+INVERSA = ('uniform', 'exponential', 'weibull', 'erlang')
+
+
+def estimar_media(generador, n, fuente, f=None, **params):
+    """
+    Estima E[f(X)] con X ~ RandomGenerators.<generador>(**params) usando `n`
+    muestras de la fuente dada. Devuelve (estimación, error estándar).
+    """
+    if generador not in INVERSA:
+        raise ValueError(f'{generador} no se genera por transformada inversa')
+    x = getattr(RandomGenerators, generador)(size=n, rng=fuente, **params)
+    y = x if f is None else f(x)
+    return float(np.mean(y)), fuente.error_estandar(y)
@@ -1,23 +1,19 @@
 import numpy as np
 
+import kernels
+
 class GameOfLife2D:
-    def __init__(self, rows=50, cols=50):
+    def __init__(self, rows=50, cols=50, seed=None):
         self.rows = rows
         self.cols = cols
         self.grid = np.zeros((rows, cols), dtype=int)
+        self.rng = np.random.default_rng(seed)
 
     def randomize(self, p=0.2):
-        self.grid = (np.random.random((self.rows, self.cols)) < p).astype(int)
+        self.grid = (self.rng.random((self.rows, self.cols)) < p).astype(int)
 
     def step(self):
-        new = np.zeros_like(self.grid)
-        for r in range(self.rows):
-            for c in range(self.cols):
-                total = np.sum(self.grid[max(0, r-1):r+2, max(0, c-1):c+2]) - self.grid[r, c]
-                if self.grid[r, c] == 1:
-                    if total == 2 or total == 3:
-                        new[r, c] = 1
-                else:
-                    if total == 3:
-                        new[r, c] = 1
-        self.grid = new
\ No newline at end of file
+        alive = self.grid == 1
+        total = kernels.moore_count(alive)
+        # Sobrevive con 2 o 3 vecinos vivos; nace con exactamente 3
+        self.grid = ((total == 3) | (alive & (total == 2))).astype(self.grid.dtype)
\ No newline at end of file
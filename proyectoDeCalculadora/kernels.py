@@ -0,0 +1,274 @@
+"""
+Núcleos de cómputo de los modelos y generadores.
+
+Al importar el módulo se elige el backend: si Numba está instalado se usan
+bucles compilados (paralelos con prange); si no, implementaciones vectorizadas
+con NumPy. La variable de entorno CALCULADORA_KERNELS=numpy fuerza el segundo.
+Numba se importa y compila recién en la primera llamada, para no encarecer el
+arranque del motor; si esa importación o la compilación de un núcleo
+fallan, se emite un aviso y el módulo pasa al backend NumPy.
+
+Ambos backends dan el mismo resultado para una misma semilla:
+- covid_step recibe los números aleatorios ya sorteados por el modelo.
+- gamma y poisson usan un generador por contador (splitmix64): el sorteo `j`
+  de la muestra `i` depende solo de (seed, i, j), no del orden en que se
+  procesan las muestras ni del número de hilos. Poisson usa solo
+  multiplicaciones y coincide bit a bit; en gamma, log/cos de cada backend
+  pueden diferir en el último bit en casos aislados.
+"""
+import importlib.util
+import math
+import os
+import warnings
+
+import numpy as np
+
+if os.environ.get('CALCULADORA_KERNELS') != 'numpy' and importlib.util.find_spec('numba') is not None:
+    BACKEND = 'numba'
+else:
+    BACKEND = 'numpy'
+
+# Poisson: λ se consume en pasos de este tamaño para que e^-λ no sufra underflow
+PASO_POISSON = 500.0
+
+_G = np.uint64(0x9E3779B97F4A7C15)
+_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_M2 = np.uint64(0x94D049BB133111EB)
+_S11 = np.uint64(11)
+_S27 = np.uint64(27)
+_S30 = np.uint64(30)
+_S31 = np.uint64(31)
+_ESCALA = 2.0 ** -53
+
+
+def _mezclar(z):
+    """Función de mezcla de splitmix64 (aritmética uint64 con desborde)."""
+    z = (z ^ (z >> _S30)) * _M1
+    z = (z ^ (z >> _S27)) * _M2
+    return z ^ (z >> _S31)
+
+
+def _uniforme(seed, i, j):
+    """Sorteo U(0, 1) abierto número `j` de la muestra `i`."""
+    with np.errstate(over='ignore'):
+        return ((_mezclar(_mezclar(seed + i * _G) + j * _G) >> _S11) + 0.5) * _ESCALA
+
+
+def _parametros_poisson(lam):
+    pasos = max(math.ceil(lam / PASO_POISSON) - 1, 0)
+    return pasos, math.exp(PASO_POISSON), math.exp(lam - pasos * PASO_POISSON)
+
+
+# ---------------- Implementaciones NumPy ----------------
+
+def moore_count(mask):
+    """Cantidad de vecinos True de cada celda en la vecindad de Moore (bordes sin envolver)."""
+    rows, cols = mask.shape
+    padded = np.pad(mask, 1).astype(np.int8)
+    return sum(padded[dr:dr + rows, dc:dc + cols] for dr in range(3) for dc in range(3)) - padded[1:-1, 1:-1]
+
+
+def _covid_step_numpy(grid, u1, u2, tabla, p_die, p_recover):
+    n = moore_count(grid == 2)
+    new = grid.copy()
+    new[(grid == 1) & (u1 < tabla[n])] = 2
+    infected = grid == 2
+    die = infected & (u1 < p_die)
+    new[die] = 4
+    new[infected & ~die & (u2 < p_recover)] = 3
+    return new
+
+
+def _gamma_numpy(d, c, seed, size):
+    out = np.empty(size)
+    activos = np.arange(size, dtype=np.uint64)
+    j = np.uint64(0)
+    while activos.size:
+        u0 = _uniforme(seed, activos, j)
+        u1 = _uniforme(seed, activos, j + np.uint64(1))
+        u2 = _uniforme(seed, activos, j + np.uint64(2))
+        j += np.uint64(3)
+        x = np.sqrt(-2.0 * np.log(u0)) * np.cos(2.0 * np.pi * u1)
+        v = 1.0 + c * x
+        positivo = v > 0
+        v = np.where(positivo, v, 1.0)
+        v = v * v * v
+        acepta = positivo & ((u2 < 1.0 - 0.0331 * (x * x * x * x))
+                             | (np.log(u2) < 0.5 * x * x + d * (1.0 - v + np.log(v))))
+        out[activos[acepta]] = d * v[acepta]
+        activos = activos[~acepta]
+    return out
+
+
+def _poisson_numpy(pasos, e_paso, e_resto, seed, size):
+    # Algoritmo de Knuth con los pasos de Junhao; solo multiplicaciones, así
+    # ambos backends producen exactamente los mismos valores.
+    out = np.empty(size, dtype=np.int64)
+    activos = np.arange(size, dtype=np.uint64)
+    p = np.ones(size)
+    quedan = np.full(size, pasos, dtype=np.int64)
+    resto = np.ones(size, dtype=bool)
+    j = np.uint64(0)
+    while activos.size:
+        p *= _uniforme(seed, activos, j)
+        j += np.uint64(1)
+        while True:
+            m = (p < 1.0) & ((quedan > 0) | resto)
+            if not m.any():
+                break
+            paso = m & (quedan > 0)
+            final = m & (quedan == 0)
+            p[paso] *= e_paso
+            quedan[paso] -= 1
+            p[final] *= e_resto
+            resto[final] = False
+        fin = p <= 1.0
+        out[activos[fin]] = int(j) - 1
+        activos, p, quedan, resto = activos[~fin], p[~fin], quedan[~fin], resto[~fin]
+    return out
+
+
+# ---------------- Implementaciones Numba ----------------
+
+_numba = None
+# Clase base de los errores de compilación de Numba (se conoce al importarlo)
+_ErrorNumba = None
+
+
+def _kernels_numba():
+    """Importa Numba y define los núcleos compilados (una sola vez)."""
+    global _numba, _ErrorNumba
+    if _numba is not None:
+        return _numba
+    import numba
+    from numba.core.errors import NumbaError
+    _ErrorNumba = NumbaError
+
+    _mezclar_nb = numba.njit(_mezclar)
+
+    @numba.njit
+    def _uniforme_nb(seed, i, j):
+        return ((_mezclar_nb(_mezclar_nb(seed + i * _G) + j * _G) >> _S11) + 0.5) * _ESCALA
+
+    @numba.njit(parallel=True, cache=True)
+    def _covid_step_numba(grid, u1, u2, tabla, p_die, p_recover):
+        rows, cols = grid.shape
+        new = np.empty_like(grid)
+        for r in numba.prange(rows):
+            for c in range(cols):
+                state = grid[r, c]
+                new[r, c] = state
+                if state == 1:
+                    n = 0
+                    for rr in range(max(0, r - 1), min(rows, r + 2)):
+                        for cc in range(max(0, c - 1), min(cols, c + 2)):
+                            if grid[rr, cc] == 2:
+                                n += 1
+                    if u1[r, c] < tabla[n]:
+                        new[r, c] = 2
+                elif state == 2:
+                    if u1[r, c] < p_die:
+                        new[r, c] = 4
+                    elif u2[r, c] < p_recover:
+                        new[r, c] = 3
+        return new
+
+    @numba.njit(parallel=True, cache=True)
+    def _gamma_numba(d, c, seed, size):
+        out = np.empty(size)
+        for i in numba.prange(size):
+            ii = np.uint64(i)
+            j = np.uint64(0)
+            while True:
+                u0 = _uniforme_nb(seed, ii, j)
+                u1 = _uniforme_nb(seed, ii, j + np.uint64(1))
+                u2 = _uniforme_nb(seed, ii, j + np.uint64(2))
+                j += np.uint64(3)
+                x = np.sqrt(-2.0 * np.log(u0)) * np.cos(2.0 * np.pi * u1)
+                v = 1.0 + c * x
+                if v <= 0:
+                    continue
+                v = v * v * v
+                if (u2 < 1.0 - 0.0331 * (x * x * x * x)
+                        or np.log(u2) < 0.5 * x * x + d * (1.0 - v + np.log(v))):
+                    out[i] = d * v
+                    break
+        return out
+
+    @numba.njit(parallel=True, cache=True)
+    def _poisson_numba(pasos, e_paso, e_resto, seed, size):
+        out = np.empty(size, dtype=np.int64)
+        for i in numba.prange(size):
+            ii = np.uint64(i)
+            j = np.uint64(0)
+            p = 1.0
+            quedan = pasos
+            resto = True
+            while True:
+                p *= _uniforme_nb(seed, ii, j)
+                j += np.uint64(1)
+                while p < 1.0 and (quedan > 0 or resto):
+                    if quedan > 0:
+                        p *= e_paso
+                        quedan -= 1
+                    else:
+                        p *= e_resto
+                        resto = False
+                if p <= 1.0:
+                    break
+            out[i] = np.int64(j) - 1
+        return out
+
+    _numba = {
+        'covid_step': _covid_step_numba,
+        'gamma': _gamma_numba,
+        'poisson': _poisson_numba,
+    }
+    return _numba
+
+
+def _despachar(nombre, implementacion_numpy, *args):
+    """
+    Llama al núcleo `nombre` del backend activo. Si Numba no se puede importar o
+    el núcleo no compila, se desactiva Numba para todo el módulo y se usa NumPy;
+    cualquier otro error (p. ej. argumentos inválidos) se propaga sin cambiar
+    de backend.
+    """
+    global BACKEND
+    if BACKEND == 'numba':
+        try:
+            return _kernels_numba()[nombre](*args)
+        except Exception as e:
+            if not isinstance(e, ImportError) and not (_ErrorNumba and isinstance(e, _ErrorNumba)):
+                raise
+            BACKEND = 'numpy'
+            warnings.warn(f'No se pudo usar Numba ({type(e).__name__}: {e}); se usa el backend NumPy',
+                          RuntimeWarning, stacklevel=3)
+    return implementacion_numpy(*args)
+
+
+# ---------------- API ----------------
+
+def covid_step(grid, u1, u2, p_infect, p_die, p_recover):
+    """
+    Un paso del modelo COVID sobre `grid` (0=vacío, 1=S, 2=I, 3=R, 4=D).
+    `u1` decide infección (S) o muerte (I); `u2`, la recuperación de I.
+    """
+    # Probabilidad de infección según el número de vecinos infectados (0..8)
+    tabla = 1.0 - (1.0 - p_infect) ** np.arange(9)
+    return _despachar('covid_step', _covid_step_numpy, grid, u1, u2, tabla, p_die, p_recover)
+
+
+def gamma(shape, seed, size):
+    """Muestras Gamma(shape >= 1, scale=1) por Marsaglia-Tsang."""
+    d = shape - 1.0 / 3.0
+    c = 1.0 / math.sqrt(9.0 * d)
+    seed = np.uint64(seed)
+    return _despachar('gamma', _gamma_numpy, d, c, seed, size)
+
+
+def poisson(lam, seed, size):
+    """Muestras Poisson(lam) por multiplicación de uniformes (Knuth)."""
+    pasos, e_paso, e_resto = _parametros_poisson(lam)
+    seed = np.uint64(seed)
+    return _despachar('poisson', _poisson_numpy, pasos, e_paso, e_resto, seed, size)
@@ -0,0 +1,249 @@
+"""
+Ejecutor por lotes (sin interfaz gráfica) de simulaciones y distribuciones.
+
+Uso: python lotes.py trabajos.yaml [--workers N] [--salida DIR]
+
+El archivo de trabajos (YAML o JSON) contiene una lista `jobs`; cada trabajo
+corre un modelo (`life2d`, `life1d`, `covid`, `covid_net`, `seir`) o un generador de
+`RandomGenerators` (`normal`, `poisson`, ...):
+
+    output_dir: resultados
+    jobs:
+      - name: covid_base
+        model: covid
+        params: {rows: 200, cols: 200, init_infected: 10, p_infect: 0.25}
+        steps: 300
+        replicas: 8
+        seed: 42
+        output: covid_base.npz
+      - name: vida
+        model: life2d
+        params: {rows: 256, cols: 256, p: 0.2}   # p: probabilidad inicial de vida
+        steps: 500
+      - name: red
+        model: covid_net
+        params: {edges: contactos.bin, init_infected: 100, p_infect: 0.05}
+        steps: 200
+      - name: gamma
+        sampler: gamma
+        params: {shape: 2.0, scale: 1.0}
+        size: 1000000
+        replicas: 4
+        output: gamma.parquet
+
+Cada réplica es una tarea independiente del pool de procesos. Los resultados de
+un trabajo se escriben en formato columnar: NPZ (una columna por array, con una
+fila por réplica) o Parquet si la salida termina en .parquet y pyarrow está
+instalado.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from motor import (CovidNetworkSimulation, CovidSEIRSimulation, CovidSimulation, GameOfLife1D, GameOfLife2D,
+                   RandomGenerators)
+
+MODELOS = ('life2d', 'life1d', 'covid', 'covid_net', 'seir')
+DISTRIBUCIONES = ('uniform', 'exponential', 'erlang', 'gamma', 'normal', 'weibull',
+                  'bernoulli', 'binomial', 'poisson')
+
+
+def crear_modelo(modelo, params, seed=None):
+    """Construye un modelo de MODELOS a partir de sus parámetros de trabajo."""
+    params = dict(params)
+    if modelo == 'covid':
+        return CovidSimulation(seed=seed, **params)
+    if modelo == 'seir':
+        return CovidSEIRSimulation(seed=seed, **params)
+    if modelo == 'covid_net':
+        # `edges`: ruta a la lista de aristas (ver covid_network.load_edge_list)
+        return CovidNetworkSimulation.from_edge_list(params.pop('edges'), seed=seed, **params)
+    if modelo == 'life2d':
+        p = params.pop('p', 0.2)
+        sim = GameOfLife2D(seed=seed, **params)
+        sim.randomize(p=p)
+        return sim
+    if modelo == 'life1d':
+        return GameOfLife1D(**params)
+    raise ValueError(f'Modelo desconocido: {modelo}')
+
+
+def _correr_modelo(modelo, params, steps, seed):
+    """Ejecuta una réplica de un modelo y devuelve sus columnas."""
+    sim = crear_modelo(modelo, params, seed)
+    if modelo in ('covid', 'covid_net', 'seir'):
+        filas = [sim.counts()]
+        for _ in range(steps):
+            sim.step()
+            filas.append(sim.counts())
+        columnas = {f'estado_{k}': np.array([f[k] for f in filas]) for k in filas[0]}
+        if modelo == 'covid_net':
+            columnas['state'] = sim.state
+        else:
+            columnas['grid'] = sim.grid
+    elif modelo == 'life2d':
+        vivos = [int(sim.grid.sum())]
+        for _ in range(steps):
+            sim.step()
+            vivos.append(int(sim.grid.sum()))
+        columnas = {'vivos': np.array(vivos), 'grid': sim.grid}
+    else:
+        historia = [sim.state.copy()]
+        for _ in range(steps):
+            sim.step()
+            historia.append(sim.state.copy())
+        columnas = {'historia': np.array(historia, dtype=np.uint8)}
+    columnas['t'] = np.arange(steps + 1)
+    return columnas
+
+
+def _correr_distribucion(nombre, params, size, seed):
+    """Genera una réplica de `size` muestras; los generadores usan el estado global."""
+    np.random.seed(seed)
+    random.seed(seed)
+    return {'x': getattr(RandomGenerators, nombre)(size=size, **params)}
+
+
+def _tarea(trabajo, replica, seed):
+    t0 = time.perf_counter()
+    if 'model' in trabajo:
+        columnas = _correr_modelo(trabajo['model'], trabajo.get('params', {}),
+                                  int(trabajo.get('steps', 100)), seed)
+    else:
+        columnas = _correr_distribucion(trabajo['sampler'], trabajo.get('params', {}),
+                                        int(trabajo.get('size', 1000)), seed)
+    return replica, columnas, time.perf_counter() - t0
+
+
+def leer_trabajos(path):
+    """Lee la especificación YAML/JSON y valida cada trabajo."""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError('Para leer YAML hace falta PyYAML (pip install pyyaml)')
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+
+    trabajos = spec.get('jobs', []) if isinstance(spec, dict) else spec
+    for i, trabajo in enumerate(trabajos):
+        trabajo.setdefault('name', f'job{i}')
+        if ('model' in trabajo) == ('sampler' in trabajo):
+            raise ValueError(f'{trabajo["name"]}: indique exactamente uno de "model" o "sampler"')
+        if trabajo.get('model', MODELOS[0]) not in MODELOS:
+            raise ValueError(f'{trabajo["name"]}: modelo no soportado {trabajo["model"]!r}')
+        if trabajo.get('sampler', DISTRIBUCIONES[0]) not in DISTRIBUCIONES:
+            raise ValueError(f'{trabajo["name"]}: distribución no soportada {trabajo["sampler"]!r}')
+        if int(trabajo.get('replicas', 1)) < 1:
+            raise ValueError(f'{trabajo["name"]}: "replicas" debe ser al menos 1')
+        trabajo.setdefault('output', f'{trabajo["name"]}.npz')
+    salida = spec.get('output_dir', '.') if isinstance(spec, dict) else '.'
+    return trabajos, salida
+
+
+def escribir_resultados(path, replicas):
+    """Escribe las réplicas (lista de dicts de columnas) en NPZ o Parquet."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError('Para escribir Parquet hace falta pyarrow (pip install pyarrow)')
+        # Formato largo: una fila por (réplica, t); las grillas no entran en una tabla
+        tabla = {}
+        for r, columnas in enumerate(replicas):
+            planas = {k: v for k, v in columnas.items() if v.ndim == 1}
+            largo = len(next(iter(planas.values())))
+            tabla.setdefault('replica', []).append(np.full(largo, r))
+            for k, v in planas.items():
+                tabla.setdefault(k, []).append(v)
+        pq.write_table(pa.table({k: np.concatenate(v) for k, v in tabla.items()}), path)
+    else:
+        with open(path, 'wb') as f:
+            np.savez(f, **{k: np.stack([c[k] for c in replicas]) for k in replicas[0]})
+
+
+def ejecutar(trabajos, salida='.', workers=None, log=None):
+    """
+    Corre todos los trabajos en un pool de procesos y devuelve (rutas escritas,
+    nombres de los trabajos que fallaron). Si una réplica falla, su trabajo no
+    se escribe pero el resto sigue corriendo.
+    """
+    if log is None:
+        def log(mensaje):
+            print(mensaje, flush=True)
+    tareas = []
+    for j, trabajo in enumerate(trabajos):
+        n = int(trabajo.get('replicas', 1))
+        semillas = np.random.SeedSequence(trabajo.get('seed')).spawn(n)
+        for r, seed_seq in enumerate(semillas):
+            tareas.append((j, r, int(seed_seq.generate_state(1)[0])))
+
+    pendientes = {j: int(t.get('replicas', 1)) for j, t in enumerate(trabajos)}
+    resultados = {j: [None] * n for j, n in pendientes.items()}
+    rutas = []
+    fallidos = []
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futuros = {pool.submit(_tarea, trabajos[j], r, seed): (j, r) for j, r, seed in tareas}
+        for hechas, futuro in enumerate(as_completed(futuros), start=1):
+            j, r = futuros[futuro]
+            nombre = trabajos[j]['name']
+            try:
+                replica, columnas, dt = futuro.result()
+            except Exception as e:
+                log(f'[{hechas}/{len(tareas)}] {nombre} réplica {r} falló: {type(e).__name__}: {e}')
+                if j in resultados:
+                    # El trabajo ya no se puede escribir; sus demás réplicas se descartan
+                    del resultados[j]
+                    fallidos.append(nombre)
+                continue
+            if j not in resultados:
+                continue
+            resultados[j][replica] = columnas
+            pendientes[j] -= 1
+            log(f'[{hechas}/{len(tareas)}] {nombre} réplica {replica} ({dt:.2f} s)')
+            if pendientes[j] == 0:
+                ruta = os.path.join(salida, trabajos[j]['output'])
+                try:
+                    escribir_resultados(ruta, resultados.pop(j))
+                except (OSError, RuntimeError, ValueError) as e:
+                    log(f'    {nombre}: no se pudo escribir {ruta}: {e}')
+                    fallidos.append(nombre)
+                    continue
+                rutas.append(ruta)
+                log(f'    -> {ruta}')
+    log(f'{len(tareas)} tareas en {time.perf_counter() - t0:.2f} s')
+    if fallidos:
+        log(f'Trabajos con errores: {", ".join(fallidos)}')
+    return rutas, fallidos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ejecuta simulaciones y distribuciones por lotes.')
+    parser.add_argument('spec', help='Archivo de trabajos (.yaml, .yml o .json)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Procesos de trabajo (por defecto, uno por CPU)')
+    parser.add_argument('--salida', default=None, help='Directorio de salida (reemplaza output_dir)')
+    args = parser.parse_args(argv)
+
+    try:
+        trabajos, salida = leer_trabajos(args.spec)
+    except (OSError, ValueError, RuntimeError) as e:
+        print('Error:', e, file=sys.stderr)
+        return 2
+    _, fallidos = ejecutar(trabajos, args.salida or salida, workers=args.workers)
+    return 1 if fallidos else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+Ejecución de un modelo de grilla en un proceso aparte, con la grilla publicada
+en memoria compartida (multiprocessing.shared_memory) con doble búfer.
+
+    puente = PuenteSimulacion(CovidSimulation(rows=1000, cols=1000))
+    puente.reanudar()
+    with puente.cuadro() as cuadro:       # en el bucle de la interfaz
+        if cuadro is not None:
+            grid, t, conteos = cuadro        # grid es una vista NumPy, sin copias
+            imagen.set_data(grid)
+    modelo, historia = puente.cerrar()
+
+El proceso de trabajo avanza el modelo sin competir por el GIL con la interfaz
+y, después de cada paso, copia la grilla al búfer que el lector no está usando
+y lo marca como el último. El lector reclama el último búfer bajo el mismo Lock,
+así que el escritor nunca lo pisa mientras se lee; si el lector tiene reclamado
+el único búfer libre, el cuadro no se publica (el modelo sigue avanzando).
+
+Órdenes por la tubería de control: reanudar, pausar, paso, ajustar(**params) y
+cerrar, que devuelve el modelo y la historia completa de conteos (un arreglo
+de forma (pasos + 1, MAX_ESTADOS)).
+"""
+import contextlib
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# 'spawn' en todas las plataformas: hacer fork de un proceso que ya usó los
+# núcleos paralelos de Numba puede dejarlo colgado
+_CTX = mp.get_context('spawn')
+
+# Cantidad de estados distintos que se cuentan por cuadro
+MAX_ESTADOS = 8
+
+# Cabecera int64: campos globales y, por búfer, [t, conteo de cada estado]
+_ULTIMO, _RECLAMADO, _PUBLICADOS, _DESCARTADOS = range(4)
+_GLOBALES = 4
+_POR_BUFER = 1 + MAX_ESTADOS
+_CAMPOS = _GLOBALES + 2 * _POR_BUFER
+# Los búferes de grilla empiezan alineados a 64 bytes
+_BYTES_CABECERA = -(-_CAMPOS * 8 // 64) * 64
+
+
+def _vistas(buf, forma, dtype):
+    """Vistas NumPy (cabecera, [búfer 0, búfer 1]) sobre el bloque compartido."""
+    cabecera = np.ndarray((_CAMPOS,), dtype=np.int64, buffer=buf)
+    tamano = int(np.prod(forma)) * np.dtype(dtype).itemsize
+    buferes = [np.ndarray(forma, dtype=dtype, buffer=buf, offset=_BYTES_CABECERA + b * tamano)
+               for b in range(2)]
+    return cabecera, buferes
+
+
+def _conteos(grid):
+    return np.bincount(grid.ravel(), minlength=MAX_ESTADOS)[:MAX_ESTADOS]
+
+
+def _publicar(model, t, cabecera, buferes, lock):
+    with lock:
+        ultimo = int(cabecera[_ULTIMO])
+        destino = 0 if ultimo < 0 else 1 - ultimo
+        if cabecera[_RECLAMADO] == destino:
+            cabecera[_DESCARTADOS] += 1
+            return
+    # `destino` no es el último ni está reclamado: el lector no lo toca hasta el cambio
+    buferes[destino][...] = model.grid
+    inicio = _GLOBALES + destino * _POR_BUFER
+    cabecera[inicio] = t
+    cabecera[inicio + 1:inicio + _POR_BUFER] = _conteos(model.grid)
+    with lock:
+        cabecera[_ULTIMO] = destino
+        cabecera[_PUBLICADOS] += 1
+
+
+def _trabajador(shm, forma, dtype, lock, conexion, model):
+    """Bucle del proceso de trabajo: atiende órdenes y avanza el modelo mientras corre."""
+    cabecera, buferes = _vistas(shm.buf, forma, dtype)
+    # Conteos de cada paso en un arreglo que duplica su tamaño al llenarse
+    historia = np.zeros((1024, MAX_ESTADOS), dtype=np.int64)
+    historia[0] = _conteos(model.grid)
+    n = 1
+    corriendo = False
+    # No todos los modelos llevan su propio contador de tiempo
+    t = getattr(model, 't', 0)
+    try:
+        _publicar(model, t, cabecera, buferes, lock)
+        while True:
+            # En pausa se bloquea un rato esperando órdenes; corriendo solo las revisa
+            if conexion.poll(0 if corriendo else 0.1):
+                orden, arg = conexion.recv()
+                if orden == 'cerrar':
+                    conexion.send((model, historia[:n]))
+                    break
+                if orden == 'reanudar':
+                    corriendo = True
+                elif orden == 'pausar':
+                    corriendo = False
+                elif orden == 'ajustar':
+                    for k, v in arg.items():
+                        if hasattr(model, k):
+                            setattr(model, k, v)
+                if orden != 'paso':
+                    continue
+            elif not corriendo:
+                continue
+            model.step()
+            t += 1
+            if n == len(historia):
+                historia = np.concatenate([historia, np.zeros_like(historia)])
+            historia[n] = _conteos(model.grid)
+            n += 1
+            _publicar(model, t, cabecera, buferes, lock)
+    finally:
+        # Las vistas deben soltarse antes de cerrar el bloque
+        del cabecera, buferes
+        shm.close()
+
+
+class PuenteSimulacion:
+    """Lado de la interfaz: lanza el proceso de trabajo y lee sus cuadros sin copiarlos."""
+
+    def __init__(self, model):
+        if not hasattr(model, 'grid'):
+            raise TypeError(f'{type(model).__name__} no tiene grilla para compartir')
+        forma, dtype = model.grid.shape, model.grid.dtype
+        tamano = _BYTES_CABECERA + 2 * model.grid.nbytes
+        self._shm = shared_memory.SharedMemory(create=True, size=tamano)
+        self._cabecera, self._buferes = _vistas(self._shm.buf, forma, dtype)
+        self._cabecera[:] = 0
+        self._cabecera[[_ULTIMO, _RECLAMADO]] = -1
+        self._lock = _CTX.Lock()
+        self._visto = 0
+        self._conexion, extremo = _CTX.Pipe()
+        # El modelo viaja una sola vez al proceso de trabajo
+        self._proceso = _CTX.Process(target=_trabajador, daemon=True,
+                                    args=(self._shm, forma, dtype, self._lock, extremo, model))
+        self._proceso.start()
+        extremo.close()
+
+    @property
+    def activo(self):
+        return self._proceso.is_alive()
+
+    @property
+    def descartados(self):
+        """Cuadros no publicados porque el lector tenía reclamado el búfer libre."""
+        return int(self._cabecera[_DESCARTADOS])
+
+    def _enviar(self, orden, arg=None):
+        self._conexion.send((orden, arg))
+
+    def reanudar(self):
+        self._enviar('reanudar')
+
+    def pausar(self):
+        self._enviar('pausar')
+
+    def paso(self):
+        self._enviar('paso')
+
+    def ajustar(self, **params):
+        """Cambia atributos del modelo (p. ej. p_infect) sin detenerlo."""
+        self._enviar('ajustar', params)
+
+    def reclamar(self):
+        """
+        Reclama el último cuadro publicado si es nuevo: devuelve (grid, t, conteos)
+        con grid como vista sobre la memoria compartida, o None. Llamar a
+        `liberar` en cuanto se deje de usar la vista.
+        """
+        with self._lock:
+            b = int(self._cabecera[_ULTIMO])
+            publicados = int(self._cabecera[_PUBLICADOS])
+            if b < 0 or publicados == self._visto:
+                return None
+            self._cabecera[_RECLAMADO] = b
+        self._visto = publicados
+        inicio = _GLOBALES + b * _POR_BUFER
+        conteos = self._cabecera[inicio + 1:inicio + _POR_BUFER]
+        return self._buferes[b], int(self._cabecera[inicio]), {k: int(conteos[k]) for k in range(MAX_ESTADOS)}
+
+    def liberar(self):
+        with self._lock:
+            self._cabecera[_RECLAMADO] = -1
+
+    @contextlib.contextmanager
+    def cuadro(self):
+        """Context manager sobre reclamar/liberar."""
+        cuadro = self.reclamar()
+        try:
+            yield cuadro
+        finally:
+            if cuadro is not None:
+                self.liberar()
+
+    def cerrar(self, timeout=5.0):
+        """
+        Detiene el proceso, libera la memoria compartida y devuelve (modelo, historia):
+        el modelo en su estado final y los conteos de cada paso. (None, None) si el
+        proceso ya no respondía.
+        """
+        resultado = (None, None)
+        if self._proceso.is_alive():
+            try:
+                self._enviar('cerrar')
+                if self._conexion.poll(timeout):
+                    resultado = self._conexion.recv()
+            except (BrokenPipeError, EOFError):
+                pass
+        self._proceso.join(timeout)
+        if self._proceso.is_alive():
+            self._proceso.terminate()
+        self._conexion.close()
+        del self._cabecera, self._buferes
+        self._shm.close()
+        self._shm.unlink()
+        return resultado
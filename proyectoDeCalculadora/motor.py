@@ -0,0 +1,36 @@
+"""
+Motor sin interfaz gráfica: modelos de simulación y generadores aleatorios.
+
+Este módulo no importa tkinter ni matplotlib, por lo que sirve para procesos de
+trabajo, ejecuciones por lotes y pruebas en servidores sin pantalla. Las
+aplicaciones gráficas (simulaciones_app.py, distribuciones_app.py) lo usan
+como única fuente de modelos.
+"""
+from game_of_life_1d import GameOfLife1D
+from game_of_life_2d import GameOfLife2D
+from covid_simulation import CovidSimulation
+from covid_network import CovidNetworkSimulation, load_edge_list
+from seir_simulation import CovidSEIRSimulation
+from random_generators import RandomGenerators
+from checkpoint import checkpoint, restore, fork
+from perfilado import Perfilador
+from fuentes_uniformes import UniformesIID, UniformesAntiteticas, UniformesLHS, UniformesSobol, estimar_media
+
+__all__ = [
+    'GameOfLife1D',
+    'GameOfLife2D',
+    'CovidSimulation',
+    'CovidNetworkSimulation',
+    'load_edge_list',
+    'CovidSEIRSimulation',
+    'RandomGenerators',
+    'checkpoint',
+    'restore',
+    'fork',
+    'Perfilador',
+    'UniformesIID',
+    'UniformesAntiteticas',
+    'UniformesLHS',
+    'UniformesSobol',
+    'estimar_media',
+]
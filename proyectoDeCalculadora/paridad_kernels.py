@@ -0,0 +1,82 @@
+"""
+Verificación de paridad de kernels.py: corre los núcleos de Numba y los de
+NumPy con las mismas entradas y compara los resultados. covid_step y poisson
+deben coincidir exactamente; gamma, con tolerancia relativa `--rtol` (log/cos
+pueden diferir en el último bit entre backends).
+
+Uso: python paridad_kernels.py [--tamano 20000] [--rtol 1e-12]
+Termina con código 1 si algún núcleo difiere; si Numba no está instalado no
+hay nada que comparar y termina con 0.
+"""
+import argparse
+import importlib.util
+import math
+import sys
+
+import numpy as np
+
+import kernels
+
+
+def _covid(k, tamano, rng):
+    lado = max(int(math.sqrt(tamano)), 3)
+    grid = rng.integers(0, 5, size=(lado, lado)).astype(np.int8)
+    u1, u2 = rng.random((2, lado, lado))
+    tabla = 1.0 - (1.0 - 0.3) ** np.arange(9)
+    args = (grid, u1, u2, tabla, 0.02, 0.1)
+    return k['covid_step'](*args), kernels._covid_step_numpy(*args)
+
+
+def _gamma(k, tamano, seed, shape):
+    d = shape - 1.0 / 3.0
+    c = 1.0 / math.sqrt(9.0 * d)
+    args = (d, c, np.uint64(seed), tamano)
+    return k['gamma'](*args), kernels._gamma_numpy(*args)
+
+
+def _poisson(k, tamano, seed, lam):
+    args = (*kernels._parametros_poisson(lam), np.uint64(seed), tamano)
+    return k['poisson'](*args), kernels._poisson_numpy(*args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compara los backends Numba y NumPy de kernels.py.')
+    parser.add_argument('--tamano', type=int, default=20000, help='Muestras (o celdas) por caso')
+    parser.add_argument('--rtol', type=float, default=1e-12, help='Tolerancia relativa para gamma')
+    args = parser.parse_args(argv)
+
+    if importlib.util.find_spec('numba') is None:
+        print('Numba no está instalado: no hay backends que comparar')
+        return 0
+    try:
+        k = kernels._kernels_numba()
+    except Exception as e:
+        print(f'No se pudo cargar Numba: {type(e).__name__}: {e}', file=sys.stderr)
+        return 1
+    rng = np.random.default_rng(0)
+
+    casos = [('covid_step', _covid(k, args.tamano, rng), None)]
+    for seed in (1, 2 ** 63 + 12345):
+        for shape in (1.0, 2.5, 40.0):
+            casos.append((f'gamma shape={shape} seed={seed}', _gamma(k, args.tamano, seed, shape), args.rtol))
+        for lam in (0.5, 20.0, 1500.0):
+            casos.append((f'poisson lam={lam} seed={seed}', _poisson(k, args.tamano, seed, lam), None))
+
+    errores = []
+    for nombre, (numba_, numpy_), rtol in casos:
+        if rtol is None:
+            distintos = int(np.count_nonzero(numba_ != numpy_))
+        else:
+            distintos = int(np.count_nonzero(~np.isclose(numba_, numpy_, rtol=rtol, atol=0.0)))
+        print(f'{nombre:40s} {"ok" if distintos == 0 else f"{distintos} diferencias"}')
+        if distintos:
+            errores.append(nombre)
+
+    if errores:
+        print(f'Backends distintos en: {", ".join(errores)}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Instrumentación liviana para medir dónde se va el tiempo de una simulación.
+
+    perf = Perfilador(activo=True)
+    with perf.fase('step'):
+        modelo.step()
+    perf.contar('celdas', modelo.rows * modelo.cols)
+    print(perf.resumen())
+
+Cuando el perfilador está inactivo, `fase` devuelve un contexto nulo compartido
+y `registrar`/`contar` retornan de inmediato, así que el costo es casi nulo.
+"""
+import contextlib
+import csv
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+_NULO = contextlib.nullcontext()
+
+
+class _Fase:
+    __slots__ = ('perf', 'nombre', 't0')
+
+    def __init__(self, perf, nombre):
+        self.perf = perf
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.perf.registrar(self.nombre, time.perf_counter() - self.t0)
+        return False
+
+
+class Perfilador:
+    """Temporizadores por fase con percentiles móviles y contadores."""
+
+    def __init__(self, activo=False, ventana=500):
+        self.activo = activo
+        self.ventana = ventana
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta todas las mediciones y contadores."""
+        self._tiempos = {}
+        self._totales = {}
+        self._n = {}
+        self.contadores = {}
+        self._inicio = time.perf_counter()
+
+    def fase(self, nombre):
+        """Context manager que mide la duración del bloque bajo `nombre`."""
+        if not self.activo:
+            return _NULO
+        return _Fase(self, nombre)
+
+    def registrar(self, nombre, segundos):
+        """Agrega una duración medida externamente (p. ej. espera en la cola de Tk)."""
+        if not self.activo:
+            return
+        if nombre not in self._tiempos:
+            self._tiempos[nombre] = deque(maxlen=self.ventana)
+            self._totales[nombre] = 0.0
+            self._n[nombre] = 0
+        self._tiempos[nombre].append(segundos)
+        self._totales[nombre] += segundos
+        self._n[nombre] += 1
+
+    def contar(self, nombre, n=1):
+        if not self.activo:
+            return
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + n
+
+    def resumen(self):
+        """
+        Devuelve un dict con, por fase, el número de mediciones, el total y los
+        percentiles p50/p90/p99 (en ms, sobre las últimas `ventana` mediciones),
+        más los contadores y su tasa por segundo de reloj.
+        """
+        transcurrido = max(time.perf_counter() - self._inicio, 1e-9)
+        # Una sola copia de los contadores, por si alguien cuenta mientras se resume
+        contadores = dict(self.contadores)
+        fases = {}
+        for nombre, tiempos in self._tiempos.items():
+            p50, p90, p99 = np.percentile(np.fromiter(tiempos, dtype=float), [50, 90, 99]) * 1000
+            fases[nombre] = {
+                'n': self._n[nombre],
+                'total_s': self._totales[nombre],
+                'media_ms': self._totales[nombre] / self._n[nombre] * 1000,
+                'p50_ms': p50,
+                'p90_ms': p90,
+                'p99_ms': p99,
+            }
+        return {
+            'transcurrido_s': transcurrido,
+            'fases': fases,
+            'contadores': contadores,
+            'tasas_por_s': {k: v / transcurrido for k, v in contadores.items()},
+        }
+
+    def texto(self):
+        """Resumen en una línea por fase, para mostrar en pantalla."""
+        r = self.resumen()
+        lineas = [f'{k}: p50 {v["p50_ms"]:.1f} ms  p90 {v["p90_ms"]:.1f} ms  p99 {v["p99_ms"]:.1f} ms'
+                  for k, v in r['fases'].items()]
+        lineas += [f'{k}: {v} ({r["tasas_por_s"][k]:.0f}/s)' for k, v in r['contadores'].items()]
+        return '\n'.join(lineas)
+
+    def exportar(self, path):
+        """Escribe el resumen en JSON o, si `path` termina en .csv, como tabla por fase."""
+        r = self.resumen()
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                w = csv.writer(f)
+                w.writerow(['nombre', 'n', 'total_s', 'media_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'tasa_por_s'])
+                for k, v in r['fases'].items():
+                    w.writerow([k, v['n'], v['total_s'], v['media_ms'], v['p50_ms'], v['p90_ms'], v['p99_ms'], ''])
+                for k, v in r['contadores'].items():
+                    w.writerow([k, v, '', '', '', '', '', r['tasas_por_s'][k]])
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(r, f, indent=2)
@@ -2,22 +2,26 @@ import math
 import random
 import numpy as np
 
+import kernels
+
 class RandomGenerators:
+    # Los generadores por transformada inversa aceptan `rng`: cualquier objeto con
+    # un método random(size) (p. ej. np.random.Generator). Por defecto, np.random.
     @staticmethod
-    def uniform(a=0.0, b=1.0, size=1):
-        u = np.random.random(size)
+    def uniform(a=0.0, b=1.0, size=1, rng=None):
+        u = (np.random if rng is None else rng).random(size)
         return a + (b - a) * u
 
     @staticmethod
-    def exponential(lam=1.0, size=1):
-        u = np.random.random(size)
+    def exponential(lam=1.0, size=1, rng=None):
+        u = (np.random if rng is None else rng).random(size)
         return -np.log(1 - u) / lam
 
     @staticmethod
-    def erlang(k=1, lam=1.0, size=1):
+    def erlang(k=1, lam=1.0, size=1, rng=None):
         if k <= 0:
             raise ValueError('k debe ser entero positivo')
-        u = np.random.random((size, k))
+        u = (np.random if rng is None else rng).random((size, k))
         exps = -np.log(1 - u) / lam
         return np.sum(exps, axis=1)
 
@@ -27,28 +31,15 @@ class RandomGenerators:
         a = shape
         if a <= 0:
             raise ValueError('shape must be > 0')
-        out = np.zeros(size)
-        for i in range(size):
-            if a < 1:
-                g = RandomGenerators.gamma(a + 1, scale=1.0, size=1)[0]
-                u = np.random.random()
-                out[i] = g * (u ** (1.0 / a))
-            else:
-                d = a - 1.0/3.0
-                c = 1.0 / math.sqrt(9.0 * d)
-                while True:
-                    x = np.random.normal()
-                    v = 1.0 + c * x
-                    if v <= 0:
-                        continue
-                    v = v**3
-                    u = np.random.random()
-                    if u < 1 - 0.0331 * (x**4):
-                        out[i] = d * v
-                        break
-                    if math.log(u) < 0.5 * x**2 + d * (1 - v + math.log(v)):
-                        out[i] = d * v
-                        break
+        # La semilla del núcleo sale del estado global, así np.random.seed sigue
+        # haciendo reproducible el resultado con cualquier backend
+        seed = np.random.randint(0, 2**63 - 1, dtype=np.int64)
+        if a < 1:
+            g = kernels.gamma(a + 1, seed, size)
+            u = np.random.random(size)
+            out = g * (u ** (1.0 / a))
+        else:
+            out = kernels.gamma(a, seed, size)
         return out * scale
 
     @staticmethod
@@ -69,8 +60,8 @@ class RandomGenerators:
         return out
 
     @staticmethod
-    def weibull(k=1.0, lam=1.0, size=1):
-        u = np.random.random(int(size))
+    def weibull(k=1.0, lam=1.0, size=1, rng=None):
+        u = (np.random if rng is None else rng).random(int(size))
         return lam * ((-np.log(1 - u)) ** (1.0 / k))
 
     @staticmethod
@@ -89,13 +80,5 @@ class RandomGenerators:
     @staticmethod
     def poisson(lam=1.0, size=1):
         size = int(size)
-        out = np.zeros(size, dtype=int)
-        for i in range(size):
-            L = math.exp(-lam)
-            k = 0
-            p = 1.0
-            while p > L:
-                k += 1
-                p *= random.random()
-            out[i] = k - 1
-        return out
\ No newline at end of file
+        seed = np.random.randint(0, 2**63 - 1, dtype=np.int64)
+        return kernels.poisson(lam, seed, size)
@@ -0,0 +1,79 @@
+import numpy as np
+
+import kernels
+from random_generators import RandomGenerators
+
+# Máximo representable por los temporizadores uint16
+MAX_TIMER = np.iinfo(np.uint16).max
+
+
+class CovidSEIRSimulation:
+    """
+    Extensión SEIR de CovidSimulation con incubación y período infeccioso de
+    duración realista.
+
+    Cada celda guarda su estado (uint8) y una cuenta regresiva en pasos (uint16):
+    3 bytes por celda. Las duraciones se sortean en bloque con
+    RandomGenerators.erlang (media `*_mean`, forma `*_k`) y las transiciones se
+    aplican con máscaras `timer == 0`:
+
+        S -> E  con la misma probabilidad por vecino infectado que CovidSimulation
+        E -> I  al terminar la incubación
+        I -> D  con probabilidad `p_die` al terminar el período infeccioso, si no I -> R
+    """
+    # States: 0=empty, 1=susceptible, 2=infected, 3=recovered, 4=dead, 5=exposed
+    def __init__(self, rows=60, cols=60, init_infected=5, p_infect=0.3, p_die=0.01,
+                 incubation_mean=5.0, incubation_k=3, infectious_mean=7.0, infectious_k=3, seed=None):
+        self.rows = rows
+        self.cols = cols
+        self.grid = np.ones((rows, cols), dtype=np.uint8)
+        self.timer = np.zeros((rows, cols), dtype=np.uint16)
+        self.t = 0
+        self.p_infect = p_infect
+        self.p_die = p_die
+        self.incubation_mean = incubation_mean
+        self.incubation_k = incubation_k
+        self.infectious_mean = infectious_mean
+        self.infectious_k = infectious_k
+        self.rng = np.random.default_rng(seed)
+
+        r = self.rng.integers(rows, size=init_infected)
+        c = self.rng.integers(cols, size=init_infected)
+        self.grid[r, c] = 2
+        self.timer[r, c] = self._durations(len(r), infectious_mean, infectious_k)
+
+    def _durations(self, n, mean, k):
+        """Sortea `n` duraciones Erlang(k, media `mean`) en pasos enteros (al menos 1)."""
+        if n == 0:
+            return np.zeros(0, dtype=np.uint16)
+        d = RandomGenerators.erlang(k=k, lam=k / mean, size=n, rng=self.rng)
+        return np.clip(np.ceil(d), 1, MAX_TIMER).astype(np.uint16)
+
+    def step(self):
+        grid = self.grid
+        n = kernels.moore_count(grid == 2)
+        tabla = 1.0 - (1.0 - self.p_infect) ** np.arange(9)
+        exposed = (grid == 1) & (self.rng.random(grid.shape, dtype=np.float32) < tabla[n])
+
+        # Cuenta regresiva de expuestos e infectados (nunca vale 0 mientras están activos)
+        active = (grid == 5) | (grid == 2)
+        np.subtract(self.timer, 1, out=self.timer, where=active)
+        done = active & (self.timer == 0)
+
+        incubated = done & (grid == 5)
+        ended = done & (grid == 2)
+
+        ended_idx = np.flatnonzero(ended)
+        dies = self.rng.random(ended_idx.size) < self.p_die
+        grid.flat[ended_idx] = np.where(dies, 4, 3)
+
+        grid[incubated] = 2
+        self.timer[incubated] = self._durations(int(incubated.sum()), self.infectious_mean, self.infectious_k)
+
+        grid[exposed] = 5
+        self.timer[exposed] = self._durations(int(exposed.sum()), self.incubation_mean, self.incubation_k)
+        self.t += 1
+
+    def counts(self):
+        counts = np.bincount(self.grid.ravel(), minlength=6)
+        return {k: int(counts[k]) for k in range(6)}
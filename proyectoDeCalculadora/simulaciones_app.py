@@ -1,108 +1,29 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import threading
 import time
 import numpy as np
-import matplotlib
-
-matplotlib.use('TkAgg')
-from matplotlib.figure import Figure
-from matplotlib.colors import ListedColormap
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-# --- Asumo que tienes estos módulos ---
-# (Si no los tienes, este código no se ejecutará)
-# Crearé clases ficticias para que el código sea ejecutable para demostración
-try:
-    from game_of_life_2d import GameOfLife2D
-    from game_of_life_1d import GameOfLife1D
-    from covid_simulation import CovidSimulation
-except ImportError:
-    print("Advertencia: Módulos de simulación no encontrados. Usando clases ficticias.")
-
-
-    # --- Clases Ficticias (SOLO PARA DEMOSTRACIÓN) ---
-    class GameOfLife2D:
-        def __init__(self, rows, cols):
-            self.rows, self.cols = rows, cols
-            self.grid = np.zeros((rows, cols))
-
-        def randomize(self, p=0.2):
-            self.grid = np.random.rand(self.rows, self.cols) < p
-
-        def step(self):
-            # Simulación muy simple: solo invierte celdas
-            self.grid = 1 - self.grid
-
-
-    class GameOfLife1D:
-        def __init__(self, length, rule):
-            self.length, self.rule = length, rule
-            self.state = np.zeros(length, dtype=int)
-
-        def reset(self):
-            self.state[self.length // 2] = 1
-
-        def step(self):
-            # Simulación muy simple: desplaza y añade ruido
-            self.state = np.roll(self.state, 1)
-            if np.random.rand() < 0.1:
-                self.state[np.random.randint(0, self.length)] = 1
-
-
-    class CovidSimulation:
-        # Estado 0: Susceptible, 1: Infectado, 2: Recuperado, 3: Muerto
-        def __init__(self, rows, cols, init_infected, p_infect, p_recover, p_die):
-            self.rows, self.cols = rows, cols
-            self.p_infect, self.p_recover, self.p_die = p_infect, p_recover, p_die
-            self.grid = np.zeros((rows, cols), dtype=int)
-            self.t = 0
-            # Colocar infectados iniciales
-            indices = np.random.choice(rows * cols, init_infected, replace=False)
-            self.grid.flat[indices] = 1
-            self.pop = rows * cols
-
-        def step(self):
-            new_grid = self.grid.copy()
-            for r in range(self.rows):
-                for c in range(self.cols):
-                    state = self.grid[r, c]
-
-                    # 1. Susceptibles (0) -> Infectados (1)
-                    if state == 0:
-                        infected_neighbors = 0
-                        for dr in [-1, 0, 1]:
-                            for dc in [-1, 0, 1]:
-                                if dr == 0 and dc == 0: continue
-                                nr, nc = (r + dr) % self.rows, (c + dc) % self.cols
-                                if self.grid[nr, nc] == 1:
-                                    infected_neighbors += 1
-
-                        if infected_neighbors > 0:
-                            # Probabilidad de infección basada en vecinos
-                            p_no_infection = (1 - self.p_infect) ** infected_neighbors
-                            if np.random.rand() > p_no_infection:
-                                new_grid[r, c] = 1
-
-                    # 2. Infectados (1) -> Recuperados (2) o Muertos (3)
-                    elif state == 1:
-                        if np.random.rand() < self.p_die:
-                            new_grid[r, c] = 3  # Muere
-                        elif np.random.rand() < self.p_recover:
-                            new_grid[r, c] = 2  # Se recupera
-
-                    # 3. Recuperados (2) y Muertos (3) no cambian
-
-            self.grid = new_grid
-            self.t += 1
-
-        def counts(self):
-            s = np.sum(self.grid == 0)
-            i = np.sum(self.grid == 1)
-            r = np.sum(self.grid == 2)
-            d = np.sum(self.grid == 3)
-            return (self.pop, s, i, r, d)
-    # --- Fin de Clases Ficticias ---
+
+from motor import GameOfLife2D, GameOfLife1D, CovidSimulation, CovidNetworkSimulation, Perfilador
+from memoria_compartida import PuenteSimulacion
+
+# Intervalo (ms) con el que se leen los cuadros del proceso de simulación (~60 fps)
+INTERVALO_PUENTE = 16
+
+# matplotlib se importa de forma diferida (ver _cargar_matplotlib): es la parte
+# más costosa del arranque y no hace falta hasta construir la primera pestaña.
+Figure = ListedColormap = FigureCanvasTkAgg = None
+
+
+def _cargar_matplotlib():
+    """Importa matplotlib con el backend TkAgg la primera vez que se necesita."""
+    global Figure, ListedColormap, FigureCanvasTkAgg
+    if Figure is None:
+        import matplotlib
+        matplotlib.use('TkAgg')
+        from matplotlib.figure import Figure
+        from matplotlib.colors import ListedColormap
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 
 class SimulacionesApp:
@@ -170,6 +91,25 @@ class SimulacionesApp:
                        foreground=[('selected', self.button_fg_color), ('active', self.text_color)])
         # --- Fin de Estilos ---
 
+        # --- Perfilado (desactivado por defecto; casi sin costo mientras lo esté) ---
+        self.perf = Perfilador()
+        self._pending = set()
+        # Frames descartados: los suman los hilos de los bucles y el hilo de Tk los
+        # pasa al perfilador (que no es seguro entre hilos) al refrescar el resumen
+        self._descartados = 0
+        self._descartados_contados = 0
+        self._perf_after = None
+        self.style.configure('TCheckbutton', background=self.frame_bg_color, foreground=self.text_color)
+        self.style.map('TCheckbutton', background=[('active', self.frame_bg_color)])
+        bar = ttk.Frame(root, style='TFrame')
+        bar.pack(side='bottom', fill='x', padx=5, pady=(0, 5))
+        self.perf_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(bar, text='Perfilado', variable=self.perf_var, command=self._perf_toggle,
+                        style='TCheckbutton').pack(side='left')
+        ttk.Button(bar, text='Exportar perfil', command=self._perf_export).pack(side='left', padx=5)
+        self.perf_text = tk.StringVar(value='')
+        ttk.Label(bar, textvariable=self.perf_text, font=('Courier', 9)).pack(side='left', padx=10)
+
         self.nb = ttk.Notebook(root, style='TNotebook')
         self.nb.pack(fill='both', expand=True, padx=5, pady=5)
 
@@ -181,15 +121,33 @@ class SimulacionesApp:
         self.cv = None
         self.cv_running = False
         self.cv_history = []
+        self.cv_puente = None
+        # Id del `after` pendiente de _cv_poll_puente, para no tener dos cadenas de sondeo
+        self.cv_puente_after = None
+
+        # Las pestañas se crean vacías y su contenido se construye al seleccionarlas
+        self._pending_tabs = {}
+        self._add_tab('Juego de la Vida 2D', self._build_gameoflife_tab)
+        self._add_tab('Juego de la Vida 1D', self._build_gameoflife1d_tab)
+        self._add_tab('Simulación COVID (grid)', self._build_covid_tab)
+        self.nb.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        self._on_tab_changed()
+
+    def _add_tab(self, text, builder):
+        """Agrega una pestaña vacía; `builder(tab)` se llama la primera vez que se muestra."""
+        tab = ttk.Frame(self.nb, style='TFrame')
+        self.nb.add(tab, text=text)
+        self._pending_tabs[str(tab)] = (tab, builder)
 
-        self._build_gameoflife_tab()
-        self._build_gameoflife1d_tab()
-        self._build_covid_tab()
+    def _on_tab_changed(self, event=None):
+        pending = self._pending_tabs.pop(self.nb.select(), None)
+        if pending is not None:
+            tab, builder = pending
+            _cargar_matplotlib()
+            builder(tab)
 
     # ---------------- Game of Life 2D (Sin cambios) ----------------
-    def _build_gameoflife_tab(self):
-        tab = ttk.Frame(self.nb, style='TFrame')
-        self.nb.add(tab, text='Juego de la Vida 2D')
+    def _build_gameoflife_tab(self, tab):
 
         left = ttk.Frame(tab, style='TFrame')
         left.pack(side='left', fill='y', padx=10, pady=10)
@@ -248,8 +206,11 @@ class SimulacionesApp:
     def _g2_step(self):
         if self.g2 is None:
             self._g2_create_random()
-        self.g2.step()
-        self._g2_draw()
+        with self.perf.fase('step'):
+            self.g2.step()
+        self.perf.contar('celdas', self.g2.rows * self.g2.cols)
+        with self.perf.fase('render'):
+            self._g2_draw()
 
     def _g2_toggle_run(self):
         self.g2_running = not self.g2_running
@@ -264,7 +225,7 @@ class SimulacionesApp:
                 time.sleep(0.1)
                 try:
                     # Asegurarse de que el paso ocurra en el hilo principal de Tkinter
-                    self.root.after(0, self._g2_step)
+                    self._schedule('g2', self._g2_step)
                 except Exception as e:
                     print('Error en loop GOL2D:', e)
                     self.g2_running = False
@@ -278,9 +239,7 @@ class SimulacionesApp:
         self._g2_draw()
 
     # ---------------- Game of Life 1D (Sin cambios) ----------------
-    def _build_gameoflife1d_tab(self):
-        tab = ttk.Frame(self.nb, style='TFrame')
-        self.nb.add(tab, text='Juego de la Vida 1D')
+    def _build_gameoflife1d_tab(self, tab):
 
         left = ttk.Frame(tab, style='TFrame')
         left.pack(side='left', fill='y', padx=10, pady=10)
@@ -315,11 +274,14 @@ class SimulacionesApp:
     def _g1_step(self):
         if self.g1 is None:
             self._g1_create()
-        self.g1.step()
+        with self.perf.fase('step'):
+            self.g1.step()
+        self.perf.contar('celdas', self.g1.length)
         self.g1_history.append(self.g1.state.copy())
         if len(self.g1_history) > 200:
             self.g1_history.pop(0)
-        self._g1_draw()
+        with self.perf.fase('render'):
+            self._g1_draw()
 
     def _g1_draw(self):
         self.g1_ax.clear()
@@ -354,9 +316,7 @@ class SimulacionesApp:
         threading.Thread(target=run_loop, daemon=True).start()
 
     # ---------------- COVID Tab (MODIFICADA) ----------------
-    def _build_covid_tab(self):
-        tab = ttk.Frame(self.nb, style='TFrame')
-        self.nb.add(tab, text='Simulación COVID (grid)')
+    def _build_covid_tab(self, tab):
 
         left = ttk.Frame(tab, style='TFrame')
         left.pack(side='left', fill='y', padx=10, pady=10)
@@ -386,6 +346,7 @@ class SimulacionesApp:
 
         # --- BOTONES MODIFICADOS ---
         ttk.Button(left, text='Crear simulación', command=self._cv_create).pack(fill='x', pady=5)
+        ttk.Button(left, text='Cargar red...', command=self._cv_load_network).pack(fill='x', pady=(0, 5))
         ttk.Button(left, text='Paso', command=self._cv_step).pack(fill='x')
 
         # Botón de Ejecutar/Parar reemplazado
@@ -396,6 +357,11 @@ class SimulacionesApp:
         ttk.Button(left, text='Limpiar', command=self._cv_clear).pack(fill='x', pady=(5, 0))
         # --- FIN DE BOTONES MODIFICADOS ---
 
+        # El modelo corre en otro proceso y la grilla llega por memoria compartida
+        self.cv_proceso_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(left, text='Proceso separado', variable=self.cv_proceso_var,
+                        style='TCheckbutton').pack(anchor='w', pady=(5, 0))
+
         fig = Figure(figsize=(7, 6), facecolor=self.frame_bg_color)
         self.cv_ax_grid = fig.add_subplot(211)
         self.cv_ax_chart = fig.add_subplot(212)
@@ -420,6 +386,23 @@ class SimulacionesApp:
         self.cv_history = [self.cv.counts()]
         self._cv_draw()
 
+    def _cv_load_network(self):
+        """Crea la simulación sobre una red de contactos leída de una lista de aristas."""
+        path = filedialog.askopenfilename(filetypes=[('Lista de aristas', '*.txt *.csv *.npy *.bin'),
+                                                     ('Todos', '*.*')])
+        if not path:
+            return
+        self._cv_stop()
+        try:
+            self.cv = CovidNetworkSimulation.from_edge_list(
+                path, init_infected=max(1, int(self.cv_init.get())), p_infect=float(self.cv_pinf.get()),
+                p_recover=float(self.cv_prec.get()), p_die=float(self.cv_pdie.get()))
+        except Exception as e:
+            messagebox.showerror('Error', f'No se pudo cargar la red: {e}')
+            return
+        self.cv_history = [self.cv.counts()]
+        self._cv_draw()
+
     def _cv_draw(self):
         # Limpiar y configurar Gráfico de Grid
         self.cv_ax_grid.clear()
@@ -441,15 +424,20 @@ class SimulacionesApp:
 
         if self.cv is not None:
             # Dibujar Grid
-            # Estados: 0=S, 1=I, 2=R, 3=D
-            # Colores: Fondo, Rojo (I), Verde (R), Gris (D)
-            cmap = ListedColormap([self.frame_bg_color, 'red', 'lightgreen', 'gray'])
-            self.cv_ax_grid.imshow(self.cv.grid, interpolation='nearest', cmap=cmap, vmin=0, vmax=3)
-            self.cv_ax_grid.set_title(f'COVID Sim t={self.cv.t}', color=self.text_color)
+            # Estados: 0=vacío, 1=S, 2=I, 3=R, 4=D
+            # Colores: Fondo, Fondo (S), Rojo (I), Verde (R), Gris (D)
+            cmap = ListedColormap([self.frame_bg_color, self.frame_bg_color, 'red', 'lightgreen', 'gray'])
+            if hasattr(self.cv, 'grid'):
+                self.cv_ax_grid.imshow(self.cv.grid, interpolation='nearest', cmap=cmap, vmin=0, vmax=4)
+                self.cv_ax_grid.set_title(f'COVID Sim t={self.cv.t}', color=self.text_color)
+            else:
+                # Las simulaciones en red no tienen grilla: solo se grafica la evolución
+                self.cv_ax_grid.set_title(f'COVID Sim en red ({self.cv.n_nodes} nodos) t={self.cv.t}',
+                                          color=self.text_color)
 
             # Dibujar Gráfico de Líneas
             times = list(range(len(self.cv_history)))
-            # Asumiendo que counts() devuelve (total, S, I, R, D)
+            # counts() devuelve un dict estado -> conteo (0=vacío, 1=S, 2=I, 3=R, 4=D)
             s = [h[1] for h in self.cv_history]
             i = [h[2] for h in self.cv_history]
             r = [h[3] for h in self.cv_history]
@@ -476,26 +464,94 @@ class SimulacionesApp:
         if self.cv is None:
             self._cv_create()
             return  # No avanzar el primer paso, solo crear
-
-        self.cv.step()
-        self.cv_history.append(self.cv.counts())
-        self._cv_draw()
+        if self.cv_puente is not None:
+            # El proceso de simulación se pausa y avanza un solo paso
+            self.cv_puente.pausar()
+            self.cv_puente.paso()
+            return
+
+        with self.perf.fase('step'):
+            self.cv.step()
+        with self.perf.fase('stats'):
+            self.cv_history.append(self.cv.counts())
+        self.perf.contar('celdas', sum(self.cv_history[-1].values()))
+        with self.perf.fase('render'):
+            self._cv_draw()
 
     # --- FUNCIONES DE CONTROL MODIFICADAS ---
 
     def _cv_run(self):
         """Inicia el bucle de simulación de COVID."""
+        if self.cv_puente is not None:
+            # Los parámetros editados se aplican sin reiniciar el modelo
+            self.cv_puente.ajustar(p_infect=float(self.cv_pinf.get()), p_recover=float(self.cv_prec.get()),
+                                   p_die=float(self.cv_pdie.get()))
+            self.cv_puente.reanudar()
+            return
         if self.cv_running:
             return  # Ya está ejecutándose
         if self.cv is None:
             self._cv_create()
 
+        if self.cv_proceso_var.get() and hasattr(self.cv, 'grid'):
+            self._cv_run_proceso()
+            return
         self.cv_running = True
         self._cv_run_loop()
 
     def _cv_stop(self):
         """Detiene el bucle de simulación de COVID."""
         self.cv_running = False
+        if self.cv_puente_after is not None:
+            self.root.after_cancel(self.cv_puente_after)
+            self.cv_puente_after = None
+        if self.cv_puente is not None:
+            # El modelo vuelve del proceso de simulación con la historia de cada paso
+            puente, self.cv_puente = self.cv_puente, None
+            model, historia = puente.cerrar()
+            if model is not None:
+                self.cv = model
+                estados = list(self.cv_history[-1])
+                self.cv_history = self.cv_history[:-1] + [{k: int(h[k]) for k in estados} for h in historia]
+            self._cv_draw()
+
+    def _cv_run_proceso(self):
+        """Mueve el modelo a un proceso aparte y muestra sus cuadros con artistas persistentes."""
+        self._cv_draw()
+        self.cv_img = self.cv_ax_grid.images[0]
+        self.cv_lines = dict(zip((1, 2, 3, 4), self.cv_ax_chart.get_lines()))
+        self.cv_live_t = list(range(len(self.cv_history)))
+        self.cv_live = {k: [h[k] for h in self.cv_history] for k in self.cv_lines}
+        self.cv_puente = PuenteSimulacion(self.cv)
+        self.cv_puente.reanudar()
+        self.cv_puente_after = self.root.after(INTERVALO_PUENTE, self._cv_poll_puente)
+
+    def _cv_poll_puente(self):
+        self.cv_puente_after = None
+        if self.cv_puente is None:
+            return
+        if not self.cv_puente.activo:
+            self._cv_stop()
+            messagebox.showerror('Error', 'El proceso de simulación terminó inesperadamente')
+            return
+        with self.perf.fase('render'):
+            with self.cv_puente.cuadro() as cuadro:
+                if cuadro is not None:
+                    grid, t, conteos = cuadro
+                    # La vista apunta a la memoria compartida; set_data guarda su propia
+                    # copia normalizada, así que el búfer se libera al salir del bloque
+                    self.cv_img.set_data(grid)
+            if cuadro is not None:
+                self.cv_live_t.append(t)
+                for k, line in self.cv_lines.items():
+                    self.cv_live[k].append(conteos[k])
+                    line.set_data(self.cv_live_t, self.cv_live[k])
+                self.cv_ax_chart.relim()
+                self.cv_ax_chart.autoscale_view()
+                self.cv_ax_grid.set_title(f'COVID Sim t={t} (proceso separado)', color=self.text_color)
+                self.cv_canvas.draw_idle()
+                self.perf.contar('frames')
+        self.cv_puente_after = self.root.after(INTERVALO_PUENTE, self._cv_poll_puente)
 
     def _cv_clear(self):
         """Detiene la simulación y limpia el lienzo."""
@@ -512,7 +568,7 @@ class SimulacionesApp:
                 time.sleep(0.1)
                 try:
                     # Asegurarse de que el paso ocurra en el hilo principal de Tkinter
-                    self.root.after(0, self._cv_step)
+                    self._schedule('cv', self._cv_step)
                 except Exception as e:
                     # Si la ventana se cierra, self.root puede dar error
                     print('Error en loop COVID:', e)
@@ -521,6 +577,57 @@ class SimulacionesApp:
         # Iniciar el hilo
         threading.Thread(target=loop, daemon=True).start()
 
+    # ---------------- Planificación y perfilado ----------------
+    def _schedule(self, key, step):
+        """Agenda `step` en el hilo de Tk; si el anterior sigue en cola, descarta el frame."""
+        if key in self._pending:
+            # Corre en el hilo del bucle: sin llamadas a Tk ni al perfilador
+            self._descartados += 1
+            return
+        self._pending.add(key)
+        self.root.after(0, self._run_scheduled, key, step, time.perf_counter())
+
+    def _run_scheduled(self, key, step, t_scheduled):
+        self._pending.discard(key)
+        self.perf.registrar('queue', time.perf_counter() - t_scheduled)
+        step()
+
+    def _perf_toggle(self):
+        # Una sola cadena de refresco aunque se apague y prenda rápido
+        if self._perf_after is not None:
+            self.root.after_cancel(self._perf_after)
+            self._perf_after = None
+        self.perf.activo = self.perf_var.get()
+        if self.perf.activo:
+            self.perf.reiniciar()
+            self._descartados_contados = self._descartados
+            self._perf_update()
+        else:
+            self.perf_text.set('')
+
+    def _perf_sincronizar(self):
+        """Pasa al perfilador los frames descartados desde la última vez (hilo de Tk)."""
+        descartados = self._descartados
+        if descartados != self._descartados_contados:
+            self.perf.contar('frames_descartados', descartados - self._descartados_contados)
+            self._descartados_contados = descartados
+
+    def _perf_update(self):
+        """Refresca el resumen en pantalla mientras el perfilado esté activo."""
+        self._perf_after = None
+        if not self.perf.activo:
+            return
+        self._perf_sincronizar()
+        self.perf_text.set(self.perf.texto().replace('\n', '   |   '))
+        self._perf_after = self.root.after(500, self._perf_update)
+
+    def _perf_export(self):
+        path = filedialog.asksaveasfilename(defaultextension='.json',
+                                            filetypes=[('JSON', '*.json'), ('CSV', '*.csv')])
+        if path:
+            self._perf_sincronizar()
+            self.perf.exportar(path)
+
 
 def main():
     root = tk.Tk()
@@ -531,6 +638,9 @@ def main():
         # Detener todos los bucles en ejecución
         app.g2_running = False
         app.cv_running = False
+        if app.cv_puente is not None:
+            # Detiene el proceso de simulación y libera la memoria compartida
+            app.cv_puente.cerrar()
         root.destroy()
 
     root.protocol("WM_DELETE_WINDOW", on_closing)
@@ -0,0 +1,275 @@
+"""
+Validación estadística de los generadores de RandomGenerators.
+
+Uso: python validacion.py [--n 10000000] [--bloque 1000000] [--dist normal ...]
+                          [--workers N] [--alfa 0.001] [--seed S] [--json informe.json]
+
+Cada caso (distribución + parámetros de la grilla GRILLA) se genera en bloques
+que se procesan en paralelo en un pool de procesos; de cada bloque solo vuelven
+resúmenes de tamaño fijo, así que se pueden validar 10^7-10^8 muestras sin
+guardarlas:
+
+- continuas: u = F(x) (transformada integral de probabilidad) contado en
+  BINS_PIT bins con np.bincount. Con esos conteos se calculan KS y
+  Anderson-Darling (sobre los bordes de los bins) y chi-cuadrado sobre
+  CELDAS_CHI2 celdas equiprobables.
+- discretas: np.bincount de los valores y chi-cuadrado contra la PMF,
+  agrupando las celdas con frecuencia esperada menor que 5.
+- todas: media y varianza contra las teóricas (sumas de potencias de x - media).
+
+Una prueba falla si su p-valor es menor que `alfa`. El código de salida es 1
+si falla alguna.
+"""
+import argparse
+import itertools
+import json
+import math
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from motor import RandomGenerators
+from densidades import DISCRETAS, acumulada, densidad, gammainc, momentos, normal_cdf
+
+# Bins de la transformada integral (resolución de KS y Anderson-Darling)
+BINS_PIT = 2 ** 16
+# Celdas equiprobables del chi-cuadrado de las continuas (divide a BINS_PIT)
+CELDAS_CHI2 = 128
+TAM_BLOQUE = 1_000_000
+ALFA = 1e-3
+
+# Parámetros a validar: cada combinación de los valores listados es un caso
+GRILLA = {
+    'uniform': {'a': [0.0, -2.0], 'b': [1.0, 5.0]},
+    'exponential': {'lam': [1.0, 3.5]},
+    'erlang': {'k': [1, 3, 10], 'lam': [2.0]},
+    'gamma': {'shape': [0.5, 2.0, 30.0], 'scale': [1.5]},
+    'normal': {'mu': [0.0, 3.0], 'sigma': [1.0, 0.5]},
+    'weibull': {'k': [0.7, 2.5], 'lam': [1.0, 3.0]},
+    'bernoulli': {'p': [0.3, 0.95]},
+    'binomial': {'n': [10, 50], 'p': [0.3, 0.9]},
+    'poisson': {'lam': [0.5, 20.0, 1500.0]},
+}
+
+
+def casos(grilla=GRILLA, distribuciones=None):
+    """Expande la grilla en una lista de (distribución, parámetros)."""
+    lista = []
+    for dist, valores in grilla.items():
+        if distribuciones and dist not in distribuciones:
+            continue
+        nombres = list(valores)
+        for combinacion in itertools.product(*(valores[k] for k in nombres)):
+            lista.append((dist, dict(zip(nombres, combinacion))))
+    return lista
+
+
+def _bloque(dist, params, n, seed, bins):
+    """Genera un bloque en un proceso de trabajo y devuelve solo sus resúmenes."""
+    # Los generadores usan el estado global de numpy y de random
+    np.random.seed(seed)
+    random.seed(seed)
+    x = np.asarray(getattr(RandomGenerators, dist)(size=n, **params), dtype=float)
+    d = x - momentos(dist, **params)[0]
+    d2 = d * d
+    resumen = {'n': x.size, 'sumas': np.array([d.sum(), d2.sum(), (d2 * d2).sum()])}
+    if dist in DISCRETAS:
+        valido = (x >= 0) & (x == np.floor(x))
+        resumen['fuera'] = int(x.size - np.count_nonzero(valido))
+        resumen['conteo'] = np.bincount(x[valido].astype(np.int64))
+    else:
+        u = acumulada(dist, x, **params)
+        resumen['fuera'] = int(np.count_nonzero(~np.isfinite(u)))
+        idx = np.clip((u[np.isfinite(u)] * bins).astype(np.int64), 0, bins - 1)
+        resumen['conteo'] = np.bincount(idx, minlength=bins)
+    return resumen
+
+
+def _sumar(acumulado, resumen):
+    if acumulado is None:
+        return resumen
+    a, b = acumulado['conteo'], resumen['conteo']
+    if len(a) < len(b):
+        a, b = b, a
+    conteo = a.copy()
+    conteo[:len(b)] += b
+    return {'n': acumulado['n'] + resumen['n'], 'sumas': acumulado['sumas'] + resumen['sumas'],
+            'fuera': acumulado['fuera'] + resumen['fuera'], 'conteo': conteo}
+
+
+# ---------------- Distribuciones de los estadísticos ----------------
+
+def _p_kolmogorov(d, n):
+    """P(D_n >= d) con la aproximación asintótica de Kolmogorov (corrección de Stephens)."""
+    lam = (math.sqrt(n) + 0.12 + 0.11 / math.sqrt(n)) * d
+    if lam < 0.2:
+        return 1.0
+    k = np.arange(1, 101)
+    return float(np.clip(2 * np.sum((-1.0) ** (k - 1) * np.exp(-2 * k * k * lam * lam)), 0.0, 1.0))
+
+
+def _p_anderson(a2):
+    """P(A² >= a2) con la distribución asintótica de Marsaglia y Marsaglia (2004)."""
+    if a2 <= 0:
+        return 1.0
+    if a2 < 2:
+        cdf = (math.exp(-1.2337141 / a2) / math.sqrt(a2)
+               * (2.00012 + (0.247105 - (0.0649821 - (0.0347962 - (0.011672 - 0.00168691 * a2) * a2) * a2) * a2) * a2))
+    else:
+        cdf = math.exp(-math.exp(1.0776 - (2.30695 - (0.43424 - (0.082433 - (0.008056 - 0.0003146 * a2) * a2) * a2) * a2) * a2))
+    return float(min(max(1.0 - cdf, 0.0), 1.0))
+
+
+def _p_chi2(x, gl):
+    return float(gammainc(gl / 2, x / 2, superior=True))
+
+
+def _chi2(observados, esperados):
+    """Chi-cuadrado agrupando celdas contiguas hasta que cada una espere al menos 5."""
+    if np.any((esperados <= 0) & (observados > 0)):
+        # Valores fuera del soporte de la distribución
+        return math.inf, 1
+    obs, esp = [], []
+    o = e = 0.0
+    for oi, ei in zip(observados, esperados):
+        o += oi
+        e += ei
+        if e >= 5:
+            obs.append(o)
+            esp.append(e)
+            o = e = 0.0
+    if esp:
+        obs[-1] += o
+        esp[-1] += e
+    obs, esp = np.array(obs), np.array(esp)
+    return float(np.sum((obs - esp) ** 2 / esp)), max(len(esp) - 1, 1)
+
+
+# ---------------- Pruebas ----------------
+
+def _prueba(nombre, estadistico, p, alfa):
+    return {'prueba': nombre, 'estadistico': estadistico, 'p': p, 'ok': p >= alfa}
+
+
+def evaluar(dist, params, resumen, alfa=ALFA):
+    """Aplica las pruebas a los resúmenes acumulados de un caso."""
+    n = resumen['n']
+    conteo = resumen['conteo']
+    pruebas = []
+    if resumen['fuera']:
+        pruebas.append(_prueba('dominio', resumen['fuera'], 0.0, alfa))
+
+    if dist in DISCRETAS:
+        k = np.arange(len(conteo), dtype=float)
+        esperados = n * densidad(dist, k, **params)
+        # Cola teórica por encima del mayor valor observado
+        cola = n * max(1.0 - float(acumulada(dist, k[-1:], **params)[0]), 0.0)
+        x2, gl = _chi2(np.append(conteo, 0), np.append(esperados, cola))
+        pruebas.append(_prueba(f'chi2 ({gl} gl)', x2, _p_chi2(x2, gl), alfa))
+    else:
+        bins = len(conteo)
+        f_emp = np.cumsum(conteo) / n
+        h = np.arange(1, bins + 1) / bins
+        d = float(np.max(np.abs(f_emp - h)))
+        pruebas.append(_prueba('KS', d, _p_kolmogorov(d, n), alfa))
+
+        # Anderson-Darling para datos agrupados sobre los bordes interiores
+        z, hh = f_emp[:-1], h[:-1]
+        a2 = float(n * np.sum((z - hh) ** 2 / (hh * (1 - hh))) / bins)
+        pruebas.append(_prueba('Anderson-Darling', a2, _p_anderson(a2), alfa))
+
+        celdas = conteo.reshape(CELDAS_CHI2, -1).sum(axis=1)
+        esp = n / CELDAS_CHI2
+        x2 = float(np.sum((celdas - esp) ** 2) / esp)
+        gl = CELDAS_CHI2 - 1
+        pruebas.append(_prueba(f'chi2 ({gl} gl)', x2, _p_chi2(x2, gl), alfa))
+
+    media, varianza = momentos(dist, **params)
+    s1, s2, s4 = resumen['sumas'] / n
+    if varianza > 0:
+        z = s1 / math.sqrt(varianza / n)
+        pruebas.append(_prueba('media', media + s1, float(2 * normal_cdf(-abs(z))), alfa))
+        # Error estándar de la varianza muestral a partir del cuarto momento central
+        var_muestral = s2 - s1 * s1
+        error = math.sqrt(max(s4 - varianza ** 2, 0.0) / n)
+        if error > 0:
+            z = (var_muestral - varianza) / error
+            pruebas.append(_prueba('varianza', var_muestral, float(2 * normal_cdf(-abs(z))), alfa))
+    return pruebas
+
+
+def validar(lista, n=10_000_000, tam_bloque=TAM_BLOQUE, workers=None, bins=BINS_PIT,
+            alfa=ALFA, seed=None, log=None):
+    """Corre todos los casos en un pool de procesos y devuelve un resultado por caso."""
+    if bins % CELDAS_CHI2:
+        raise ValueError(f'bins debe ser múltiplo de {CELDAS_CHI2}')
+    if log is None:
+        def log(mensaje):
+            print(mensaje, flush=True)
+    tamanos = [tam_bloque] * (n // tam_bloque) + ([n % tam_bloque] if n % tam_bloque else [])
+
+    resumenes = [None] * len(lista)
+    pendientes = [len(tamanos)] * len(lista)
+    resultados = [None] * len(lista)
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futuros = {}
+        for c, ((dist, params), semilla) in enumerate(zip(lista, np.random.SeedSequence(seed).spawn(len(lista)))):
+            for tam, seed_seq in zip(tamanos, semilla.spawn(len(tamanos))):
+                futuro = pool.submit(_bloque, dist, params, tam, int(seed_seq.generate_state(1)[0]), bins)
+                futuros[futuro] = c
+        for hechas, futuro in enumerate(as_completed(futuros), start=1):
+            c = futuros[futuro]
+            resumenes[c] = _sumar(resumenes[c], futuro.result())
+            pendientes[c] -= 1
+            if pendientes[c] == 0:
+                dist, params = lista[c]
+                pruebas = evaluar(dist, params, resumenes[c], alfa)
+                resumenes[c] = None
+                resultados[c] = {'dist': dist, 'params': params, 'n': n, 'pruebas': pruebas,
+                                 'ok': all(p['ok'] for p in pruebas)}
+                estado = 'OK' if resultados[c]['ok'] else 'FALLA'
+                log(f'[{hechas}/{len(futuros)}] {dist} {params}: {estado}')
+    log(f'{len(lista)} casos, {len(futuros)} bloques en {time.perf_counter() - t0:.2f} s')
+    return resultados
+
+
+def informe(resultados):
+    """Texto con una línea por prueba y un resumen final."""
+    lineas = []
+    for r in resultados:
+        params = ', '.join(f'{k}={v}' for k, v in r['params'].items())
+        lineas.append(f'{"OK   " if r["ok"] else "FALLA"} {r["dist"]}({params})  n={r["n"]}')
+        for p in r['pruebas']:
+            marca = '' if p['ok'] else '  <--'
+            lineas.append(f'        {p["prueba"]:<18} {p["estadistico"]:>14.6g}   p={p["p"]:.4g}{marca}')
+    fallas = sum(not r['ok'] for r in resultados)
+    lineas.append(f'{len(resultados) - fallas}/{len(resultados)} casos sin fallas')
+    return '\n'.join(lineas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pruebas de bondad de ajuste de RandomGenerators.')
+    parser.add_argument('--n', type=float, default=1e7, help='Muestras por caso (por defecto 1e7)')
+    parser.add_argument('--bloque', type=float, default=TAM_BLOQUE, help='Muestras por bloque')
+    parser.add_argument('--dist', nargs='*', choices=list(GRILLA), help='Distribuciones a validar (por defecto, todas)')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos de trabajo (por defecto, uno por CPU)')
+    parser.add_argument('--alfa', type=float, default=ALFA, help='Nivel de significación de cada prueba')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--json', default=None, help='Guarda el informe en este archivo JSON')
+    args = parser.parse_args(argv)
+
+    resultados = validar(casos(distribuciones=args.dist), n=int(args.n), tam_bloque=int(args.bloque),
+                         workers=args.workers, alfa=args.alfa, seed=args.seed)
+    print(informe(resultados))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+    return 0 if all(r['ok'] for r in resultados) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())